@@ -2,64 +2,102 @@
 
 from __future__ import annotations
 
-from libhitachiprojector.hitachiprojector import HitachiProjectorConnection, ReplyType
-from pypjlink import Projector
-from pypjlink.projector import ProjectorError
+import asyncio
+from collections.abc import Callable
+import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util.hass_dict import HassKey
 
-PLATFORMS: list[Platform] = [Platform.MEDIA_PLAYER, Platform.SENSOR, Platform.SWITCH]
-ERR_PROJECTOR_UNAVAILABLE = "projector unavailable"
+from .command_queue import HitachiProjectorCommandQueue
+from .const import (
+    CONF_CAPABILITIES,
+    CONF_DEBUG_PROFILING,
+    CONF_DEVICE_INFO,
+    CONF_PROFILE_THRESHOLD,
+    DEFAULT_PROFILE_THRESHOLD,
+    DOMAIN,
+    POLL_INTERVAL_ON,
+    REGISTER_REFRESH_INTERVALS,
+    SOURCE_TO_SET_COMMAND,
+)
+from .coordinator import HitachiProjectorCoordinator
+from .fleet import HitachiProjectorFleet
+from .pjlink import PJLinkError
+from .profiler import HitachiProjectorProfiler
+from .services import async_setup_services
+from .snapshot import HitachiProjectorSnapshot
+from .stats import HitachiProjectorStats
+from .transport import HitachiProjectorTransport
+from .usage import USAGE_COUNTERS, HitachiProjectorUsageHistory
 
-type HitachiProjectorConfigEntry = ConfigEntry[HitachiProvider]
-
-
-class PJLinkProvider:
-    """Provider for PJLink protocol."""
+_LOGGER = logging.getLogger(__name__)
 
-    host: str
-    password: str
-    port: int
+DATA_FLEET: HassKey[HitachiProjectorFleet] = HassKey(f"{DOMAIN}_fleet")
 
-    def __init__(self, host: str, password: str) -> None:
-        """Initialize PJLinkProvider."""
-        self.host = host
-        self.password = password
-        self.port = 4352
+PLATFORMS: list[Platform] = [
+    Platform.MEDIA_PLAYER,
+    Platform.SELECT,
+    Platform.SENSOR,
+    Platform.SWITCH,
+]
 
-    def projector(self):
-        """Create PJLink Projector instance."""
-
-        try:
-            projector = Projector.from_address(self.host, self.port)
-            projector.authenticate(self.password)
-        except (TimeoutError, OSError) as err:
-            raise ProjectorError(ERR_PROJECTOR_UNAVAILABLE) from err
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-        return projector
+type HitachiProjectorConfigEntry = ConfigEntry[HitachiProvider]
 
 
 class HitachiProvider:
-    """Hitachi Projector provider. Includes PJLink and proprietary Hitachi protocol connections."""
+    """Hitachi Projector provider. Includes the transport to the projector."""
 
-    pjlink_provider: PJLinkProvider
-    hitachi_connection: HitachiProjectorConnection
+    transport: HitachiProjectorTransport
+    coordinator: HitachiProjectorCoordinator
+    command_queue: HitachiProjectorCommandQueue
     device_info: DeviceInfo
+    sources: list[str]
+    usage_history: HitachiProjectorUsageHistory
+    snapshot: HitachiProjectorSnapshot
 
     def __init__(
         self,
-        hitachi_connection: HitachiProjectorConnection,
-        pjlink_provider: PJLinkProvider,
+        transport: HitachiProjectorTransport,
+        coordinator: HitachiProjectorCoordinator,
+        command_queue: HitachiProjectorCommandQueue,
         device_info: DeviceInfo,
+        sources: list[str],
+        usage_history: HitachiProjectorUsageHistory,
+        snapshot: HitachiProjectorSnapshot,
     ) -> None:
         """Initialize HitachiProvider."""
-        self.hitachi_connection = hitachi_connection
-        self.pjlink_provider = pjlink_provider
+        self.transport = transport
+        self.coordinator = coordinator
+        self.command_queue = command_queue
         self.device_info = device_info
+        self.sources = sources
+        self.usage_history = usage_history
+        self.snapshot = snapshot
+
+    def supports(self, register: str) -> bool:
+        """Return if the model supports a status, assuming it does until probed.
+
+        Power is read on every poll rather than probed, every model has it.
+        """
+        supported = self.coordinator.supported_registers
+        return supported is None or register in supported or register == "power_status"
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Hitachi Projector services."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(
@@ -70,29 +108,80 @@ async def async_setup_entry(
     host = entry.data[CONF_HOST]
     password = entry.data[CONF_PASSWORD]
 
-    hitachi_connection = HitachiProjectorConnection(host=host, password=password)
-    reply_type, _ = await hitachi_connection.get_power_status()
-    if reply_type != ReplyType.DATA:
-        raise ConfigEntryNotReady(f"Unable to connect to {entry.data[CONF_HOST]}")
+    fleet = _async_join_fleet(hass, entry)
 
-    pjlink_provider = PJLinkProvider(host, password)
-    device_info = DeviceInfo()
-    try:
-        with pjlink_provider.projector() as projector:
-            device_info["name"] = projector.get_name()
-            device_info["manufacturer"] = projector.get_manufacturer()
-            device_info["model"] = projector.get_product_name()
-    except ProjectorError as err:
-        raise ConfigEntryNotReady(
-            f"Unable to connect to {entry.data[CONF_HOST]}"
-        ) from err
+    stats = HitachiProjectorStats()
+    profiler = _async_setup_profiler(entry)
+
+    transport = HitachiProjectorTransport(
+        host=host, password=password, stats=stats, profiler=profiler
+    )
+    capabilities = entry.data.get(CONF_CAPABILITIES)
+    if capabilities and set(capabilities.get("probed", ())) != set(
+        REGISTER_REFRESH_INTERVALS
+    ):
+        # Probe again, statuses were added since the capabilities were stored
+        capabilities = None
+    coordinator = HitachiProjectorCoordinator(
+        hass,
+        entry,
+        transport,
+        fleet,
+        profiler,
+        capabilities["registers"] if capabilities else None,
+    )
+    snapshot = HitachiProjectorSnapshot(hass, entry.entry_id)
+    if restored := await snapshot.async_load():
+        coordinator.async_restore(*restored)
 
+    if cached_device_info := entry.data.get(CONF_DEVICE_INFO):
+        # Set up with the identity stored on a previous start, without waiting
+        # for the projector. It is polled, and its identity refreshed, once
+        # Home Assistant started. Until then no refresh is scheduled, not even
+        # when the first entities start listening.
+        device_info = DeviceInfo(**cached_device_info)
+        coordinator.update_interval = None
+    else:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except ConfigEntryNotReady:
+            await transport.async_close()
+            raise
+        try:
+            async with fleet.async_poll_slot():
+                device_info = await transport.async_get_device_info()
+        except PJLinkError as err:
+            await transport.async_close()
+            raise ConfigEntryNotReady(
+                f"Unable to connect to {entry.data[CONF_HOST]}"
+            ) from err
+        _async_store_device_info(hass, entry, device_info)
+
+    usage_history = HitachiProjectorUsageHistory(hass, entry.entry_id)
+    await usage_history.async_load()
+    # Added ahead of the entities, so the history is current when they update
+    _async_track_usage(entry, coordinator, usage_history)
+    _async_track_snapshot(entry, coordinator, snapshot)
+
+    command_queue = HitachiProjectorCommandQueue(hass, entry, coordinator, transport)
     entry.runtime_data = HitachiProvider(
-        hitachi_connection, pjlink_provider, device_info
+        transport,
+        coordinator,
+        command_queue,
+        device_info,
+        capabilities["sources"] if capabilities else list(SOURCE_TO_SET_COMMAND),
+        usage_history,
+        snapshot,
     )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if not capabilities:
+        _async_watch_capabilities(hass, entry)
+
+    if cached_device_info:
+        _async_refresh_when_started(hass, entry)
+
     return True
 
 
@@ -100,4 +189,274 @@ async def async_unload_entry(
     hass: HomeAssistant, entry: HitachiProjectorConfigEntry
 ) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        await entry.runtime_data.command_queue.async_shutdown()
+        await entry.runtime_data.transport.async_close()
+        await entry.runtime_data.snapshot.async_flush()
+    return unload_ok
+
+
+async def async_remove_entry(
+    hass: HomeAssistant, entry: HitachiProjectorConfigEntry
+) -> None:
+    """Remove the usage history and snapshot of a removed config entry."""
+    await HitachiProjectorUsageHistory(hass, entry.entry_id).async_remove()
+    await HitachiProjectorSnapshot(hass, entry.entry_id).async_remove()
+
+
+@callback
+def async_add_supported_entities(
+    async_add_entities: Callable[[list[Entity]], None],
+    entry: HitachiProjectorConfigEntry,
+    entities: list[Entity],
+) -> None:
+    """Add the entities the model supports.
+
+    Entities with a register attribute are only added if the model supports
+    that status. The registry entries of the others are kept, so they show as
+    unavailable and keep their customisations should a later probe find the
+    status after all.
+    """
+    provider = entry.runtime_data
+    async_add_entities(
+        [
+            entity
+            for entity in entities
+            if (register := getattr(entity, "register", None)) is None
+            or provider.supports(register)
+        ]
+    )
+
+
+@callback
+def _async_setup_profiler(
+    entry: HitachiProjectorConfigEntry,
+) -> HitachiProjectorProfiler:
+    """Create the profiler and follow the debug profiling options."""
+    profiler = HitachiProjectorProfiler()
+
+    @callback
+    def _async_configure() -> None:
+        profiler.configure(
+            entry.options.get(CONF_DEBUG_PROFILING, False),
+            entry.options.get(CONF_PROFILE_THRESHOLD, DEFAULT_PROFILE_THRESHOLD * 1000)
+            / 1000,
+        )
+
+    async def _async_update_options(
+        hass: HomeAssistant, entry: HitachiProjectorConfigEntry
+    ) -> None:
+        # Profiling options apply without a reload
+        _async_configure()
+
+    _async_configure()
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
+    return profiler
+
+
+@callback
+def _async_track_usage(
+    entry: HitachiProjectorConfigEntry,
+    coordinator: HitachiProjectorCoordinator,
+    usage_history: HitachiProjectorUsageHistory,
+) -> None:
+    """Record the hour counters in the usage history whenever they are read.
+
+    The listener has no context, so the counters are only polled while an
+    entity shows them or their forecast.
+    """
+
+    @callback
+    def _async_record() -> None:
+        if (data := coordinator.data) is None:
+            return
+        for counter in USAGE_COUNTERS:
+            if (hours := getattr(data, counter)) is not None:
+                usage_history.async_record(counter, hours)
+
+    _async_record()
+    entry.async_on_unload(coordinator.async_add_listener(_async_record))
+
+
+@callback
+def _async_track_snapshot(
+    entry: HitachiProjectorConfigEntry,
+    coordinator: HitachiProjectorCoordinator,
+    snapshot: HitachiProjectorSnapshot,
+) -> None:
+    """Save the statuses whenever they were polled or set."""
+
+    @callback
+    def _async_save() -> None:
+        if coordinator.data is not None:
+            snapshot.async_save_later(coordinator)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_save))
+
+
+@callback
+def _async_join_fleet(
+    hass: HomeAssistant, entry: HitachiProjectorConfigEntry
+) -> HitachiProjectorFleet:
+    """Add a config entry to the fleet shared by all entries."""
+    if (fleet := hass.data.get(DATA_FLEET)) is None:
+        fleet = hass.data[DATA_FLEET] = HitachiProjectorFleet()
+    fleet.async_register(entry.entry_id)
+
+    @callback
+    def _async_leave_fleet() -> None:
+        fleet.async_unregister(entry.entry_id)
+        if not fleet.size:
+            hass.data.pop(DATA_FLEET)
+
+    entry.async_on_unload(_async_leave_fleet)
+    return fleet
+
+
+@callback
+def _async_watch_capabilities(
+    hass: HomeAssistant, entry: HitachiProjectorConfigEntry
+) -> None:
+    """Store what the model supports once every status was probed."""
+    coordinator = entry.runtime_data.coordinator
+    remove_listener: CALLBACK_TYPE | None = None
+
+    @callback
+    def _async_check() -> None:
+        nonlocal remove_listener
+        if remove_listener is None or (
+            (registers := coordinator.probed_registers) is None
+        ):
+            return
+
+        remove_listener()
+        remove_listener = None
+        entry.async_create_background_task(
+            hass,
+            _async_store_capabilities(hass, entry, registers),
+            f"{DOMAIN} {entry.title} capabilities",
+        )
+
+    @callback
+    def _async_stop() -> None:
+        if remove_listener is not None:
+            remove_listener()
+
+    remove_listener = coordinator.async_add_listener(_async_check)
+    entry.async_on_unload(_async_stop)
+    _async_check()
+
+
+async def _async_store_capabilities(
+    hass: HomeAssistant, entry: HitachiProjectorConfigEntry, registers: set[str]
+) -> None:
+    """Query the sources, persist the capabilities and drop unsupported entities."""
+    provider = entry.runtime_data
+    try:
+        async with provider.coordinator.fleet.async_poll_slot():
+            sources = await provider.transport.async_get_sources()
+    except PJLinkError as err:
+        # Probe again on the next start
+        _LOGGER.debug("Unable to query sources of %s: %s", entry.title, err)
+        return
+
+    hass.config_entries.async_update_entry(
+        entry,
+        data={
+            **entry.data,
+            CONF_CAPABILITIES: {
+                "registers": sorted(registers),
+                "probed": sorted(REGISTER_REFRESH_INTERVALS),
+                "sources": sources,
+            },
+        },
+    )
+
+    if registers != set(REGISTER_REFRESH_INTERVALS) or sources != provider.sources:
+        _LOGGER.debug(
+            "%s supports %s with sources %s, reloading",
+            entry.title,
+            sorted(registers),
+            sources,
+        )
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
+
+@callback
+def _async_refresh_when_started(
+    hass: HomeAssistant, entry: HitachiProjectorConfigEntry
+) -> None:
+    """Run the first poll and refresh the identity in the background, once started.
+
+    The first polls of the fleet after a start are spread out, and only read
+    the statuses the restored snapshot has no current value for. Entries set
+    up while running, such as on a reload, poll right away.
+    """
+    starting = hass.state is not CoreState.running
+
+    async def _async_refresh() -> None:
+        coordinator = entry.runtime_data.coordinator
+        if starting:
+            await asyncio.sleep(coordinator.fleet.startup_delay(entry.entry_id))
+        # Scheduled from here on, after this refresh by the interval it picks
+        coordinator.update_interval = POLL_INTERVAL_ON
+        await coordinator.async_refresh()
+        await _async_refresh_device_info(hass, entry)
+
+    @callback
+    def _async_started(hass: HomeAssistant) -> None:
+        entry.async_create_background_task(
+            hass, _async_refresh(), f"{DOMAIN} {entry.title} first refresh"
+        )
+
+    entry.async_on_unload(async_at_started(hass, _async_started))
+
+
+async def _async_refresh_device_info(
+    hass: HomeAssistant, entry: HitachiProjectorConfigEntry
+) -> None:
+    """Re-read the projector identity and update the cache if it changed."""
+    provider = entry.runtime_data
+    try:
+        async with provider.coordinator.fleet.async_poll_slot():
+            device_info = await provider.transport.async_get_device_info()
+    except PJLinkError as err:
+        _LOGGER.debug("Unable to refresh device info of %s: %s", entry.title, err)
+        return
+
+    if device_info == provider.device_info:
+        return
+
+    previous, provider.device_info = provider.device_info, device_info
+    _async_store_device_info(hass, entry, device_info)
+
+    device_registry = dr.async_get(hass)
+    if device := device_registry.async_get_device(
+        identifiers={(DOMAIN, entry.entry_id)}
+    ):
+        device_registry.async_update_device(
+            device.id,
+            manufacturer=device_info.get("manufacturer"),
+            model=device_info.get("model"),
+            name=device_info.get("name"),
+        )
+
+    if CONF_CAPABILITIES in entry.data and any(
+        device_info.get(key) != previous.get(key) for key in ("manufacturer", "model")
+    ):
+        # Another model may support other statuses
+        _LOGGER.debug("%s changed to %s, probing again", entry.title, device_info)
+        data = dict(entry.data)
+        data.pop(CONF_CAPABILITIES)
+        hass.config_entries.async_update_entry(entry, data=data)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
+
+@callback
+def _async_store_device_info(
+    hass: HomeAssistant, entry: HitachiProjectorConfigEntry, device_info: DeviceInfo
+) -> None:
+    """Persist the projector identity in the config entry."""
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_DEVICE_INFO: dict(device_info)}
+    )
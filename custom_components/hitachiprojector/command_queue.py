@@ -0,0 +1,256 @@
+"""Command queue for the Hitachi Projector integration."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from enum import Enum
+import logging
+import time
+from typing import Any
+
+from libhitachiprojector.hitachiprojector import Command, PowerStatus, ReplyType
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, InvalidStateError
+
+from .const import COMMAND_INTERVAL, DOMAIN, SCENE_RETRY_INTERVAL, SCENE_WARMUP_TIMEOUT
+from .coordinator import HitachiProjectorCoordinator
+from .registers import FRAMES, ExtendedCommand
+from .transport import HitachiProjectorTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingCommand:
+    """Command waiting to be sent, with everyone waiting on its result."""
+
+    command: Command | ExtendedCommand
+    value: Any
+    waiters: list[asyncio.Future[None]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class SceneStep:
+    """Status set by a scene, with the command setting it."""
+
+    register: str
+    value: Any
+    command: Command | ExtendedCommand
+
+
+class HitachiProjectorCommandQueue:
+    """Send commands to a projector one at a time, at a pace it can handle.
+
+    Commands are keyed by the status they change. A command that is still
+    pending is replaced by a newer one for the same status, and a command that
+    would not change the status is dropped. The cached status only decides
+    that while it is fresh, otherwise the status is read first.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        coordinator: HitachiProjectorCoordinator,
+        transport: HitachiProjectorTransport,
+    ) -> None:
+        """Initialize the command queue."""
+        self.hass = hass
+        self.config_entry = config_entry
+        self.coordinator = coordinator
+        self.transport = transport
+
+        self._pending: dict[str, _PendingCommand] = {}
+        self._worker: asyncio.Task | None = None
+        self._last_sent = 0.0
+        self._scene_lock = asyncio.Lock()
+
+    async def async_send(
+        self, register: str, value: Any, command: Command | ExtendedCommand
+    ) -> None:
+        """Queue a command setting a status and wait until it was applied."""
+        self._raise_if_unreachable()
+
+        if register not in self._pending and await self._async_is_current(
+            register, value
+        ):
+            _LOGGER.debug("Dropping %s, %s is already %s", command, register, value)
+            return
+
+        if (pending := self._pending.get(register)) is not None:
+            _LOGGER.debug("Replacing pending %s with %s", pending.command, command)
+            pending.command = command
+            pending.value = value
+        else:
+            pending = self._pending[register] = _PendingCommand(command, value)
+
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        pending.waiters.append(future)
+
+        if self._worker is None or self._worker.done():
+            self._worker = self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_run(),
+                f"{DOMAIN} {self.config_entry.title} command queue",
+            )
+
+        await future
+
+    async def async_apply_scene(self, steps: list[SceneStep]) -> list[dict[str, Any]]:
+        """Apply several statuses in one go and return the outcome of each step.
+
+        Power on is sent first and power off last, every other step keeps its
+        order. Steps whose status is already current are skipped. While power
+        changes, commands the projector rejects are retried until it is ready.
+        The scene stops at the first step that fails.
+        """
+        self._raise_if_unreachable()
+
+        results: list[dict[str, Any]] = []
+        async with self._scene_lock:
+            # Power changes in progress delay every other command as well
+            ready_by = (
+                time.monotonic() + SCENE_WARMUP_TIMEOUT
+                if self.coordinator.data is not None
+                and self.coordinator.data.power_status == PowerStatus.CoolDown
+                else None
+            )
+            failed = False
+            for step in sorted(steps, key=_scene_order):
+                result: dict[str, Any] = {
+                    "setting": step.register,
+                    "value": _value_name(step.value),
+                    "attempts": 0,
+                    "duration": 0.0,
+                }
+                results.append(result)
+                if failed:
+                    result["result"] = "cancelled"
+                    continue
+                if await self._async_is_current(step.register, step.value):
+                    result["result"] = "skipped"
+                    continue
+
+                start = time.monotonic()
+                try:
+                    await self._async_apply_step(step, result, ready_by)
+                except (HomeAssistantError, OSError, RuntimeError) as err:
+                    _LOGGER.debug("Scene step %s failed: %s", step.command, err)
+                    failed = True
+                    result["result"] = "failed"
+                    result["error"] = str(err)
+                else:
+                    result["result"] = "applied"
+                    if step.register == "power_status":
+                        ready_by = time.monotonic() + SCENE_WARMUP_TIMEOUT
+                result["duration"] = round(time.monotonic() - start, 3)
+        return results
+
+    async def async_shutdown(self) -> None:
+        """Stop sending and cancel everything still pending."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        for pending in self._pending.values():
+            for future in pending.waiters:
+                future.cancel()
+        self._pending.clear()
+
+    async def _async_run(self) -> None:
+        """Send pending commands in order until the queue is empty."""
+        while self._pending:
+            # Wait before picking the next command, so that anything queued
+            # meanwhile still gets coalesced
+            await self._async_pace()
+
+            register = next(iter(self._pending))
+            pending = self._pending.pop(register)
+            try:
+                if await self._async_is_current(register, pending.value):
+                    _LOGGER.debug("Skipping %s, already applied", pending.command)
+                else:
+                    await self.coordinator.profiler.wrap(
+                        "command", self._async_execute(register, pending)
+                    )
+            except (HomeAssistantError, OSError, RuntimeError) as err:
+                for future in pending.waiters:
+                    if not future.done():
+                        future.set_exception(err)
+            else:
+                for future in pending.waiters:
+                    if not future.done():
+                        future.set_result(None)
+
+    async def _async_apply_step(
+        self, step: SceneStep, result: dict[str, Any], ready_by: float | None
+    ) -> None:
+        """Send a scene step, retrying it until the projector is ready for it."""
+        pending = _PendingCommand(step.command, step.value)
+        while True:
+            await self._async_pace()
+            result["attempts"] += 1
+            try:
+                await self.coordinator.profiler.wrap(
+                    "command", self._async_execute(step.register, pending)
+                )
+            except InvalidStateError:
+                if (
+                    ready_by is None
+                    or time.monotonic() + SCENE_RETRY_INTERVAL > ready_by
+                ):
+                    raise
+                _LOGGER.debug("%s rejected, retrying while warming up", step.command)
+                await asyncio.sleep(SCENE_RETRY_INTERVAL)
+            else:
+                return
+
+    async def _async_pace(self) -> None:
+        """Wait until the next command may be sent."""
+        if (delay := self._last_sent + COMMAND_INTERVAL - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+    async def _async_execute(self, register: str, pending: _PendingCommand) -> None:
+        """Send a command and hand its result to the coordinator."""
+        reply_type, _ = await self.transport.async_send_cmd(FRAMES[pending.command])
+        self._last_sent = time.monotonic()
+        if reply_type != ReplyType.ACK:
+            raise InvalidStateError("Unexpected reply type")
+
+        await self.coordinator.async_command_acknowledged(register, pending.value)
+
+    def _raise_if_unreachable(self) -> None:
+        """Reject commands while the projector is unreachable."""
+        if self.coordinator.unreachable:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="unreachable",
+                translation_placeholders={"host": self.transport.host},
+            )
+
+    async def _async_is_current(self, register: str, value: Any) -> bool:
+        """Return if the projector already has a status set to a value.
+
+        The cached status is only trusted while it is fresh, otherwise it is
+        read from the projector first.
+        """
+        coordinator = self.coordinator
+        if not coordinator.last_update_success or coordinator.data is None:
+            return False
+        if coordinator.is_fresh(register):
+            return getattr(coordinator.data, register) == value
+        return await coordinator.async_read_status(register) == value
+
+
+def _scene_order(step: SceneStep) -> int:
+    """Sort power on before and power off after every other scene step."""
+    if step.register != "power_status":
+        return 1
+    return 0 if step.value == PowerStatus.On else 2
+
+
+def _value_name(value: Any) -> Any:
+    """Return a status value the way it is reported to the user."""
+    return value.name if isinstance(value, Enum) else value
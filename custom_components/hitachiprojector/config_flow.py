@@ -2,23 +2,48 @@
 
 from __future__ import annotations
 
+import asyncio
+from ipaddress import IPv4Network, ip_network
 import logging
 from typing import Any
 
-from libhitachiprojector.hitachiprojector import HitachiProjectorConnection, ReplyType
+from libhitachiprojector.hitachiprojector import ReplyType
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    SOURCE_INTEGRATION_DISCOVERY,
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_HOST, CONF_PASSWORD
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN
+from .const import (
+    CONF_DEBUG_PROFILING,
+    CONF_FILTER_LIFE,
+    CONF_LAMP_LIFE,
+    CONF_PROFILE_THRESHOLD,
+    DEFAULT_FILTER_LIFE,
+    DEFAULT_LAMP_LIFE,
+    DEFAULT_PROFILE_THRESHOLD,
+    DISCOVERY_MAX_HOSTS,
+    DOMAIN,
+)
+from .discovery import DiscoveredProjector, async_discover_projectors
+from .transport import HitachiProjectorTransport
 
 _LOGGER = logging.getLogger(__name__)
 
 TITLE = "Hitachi Projector"
 
+CONF_NETWORK = "network"
+CONF_HOSTS = "hosts"
+CONF_TITLE = "title"
+
 
 class HitachiProjectorHub:
     """HitachiProjector hub."""
@@ -29,8 +54,11 @@ class HitachiProjectorHub:
 
     async def authenticate(self, password: str) -> bool:
         """Test if we can authenticate with the host."""
-        con = HitachiProjectorConnection(host=self.host, password=password)
-        reply_type, _ = await con.get_power_status()
+        transport = HitachiProjectorTransport(host=self.host, password=password)
+        try:
+            reply_type, _ = await transport.get_power_status()
+        finally:
+            await transport.async_close()
         if reply_type == ReplyType.DATA:
             return True
 
@@ -65,12 +93,32 @@ class HitachiProjectorConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._discovered: dict[str, DiscoveredProjector] = {}
+        self._password = ""
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: ConfigEntry,
+    ) -> HitachiProjectorOptionsFlow:
+        """Create the options flow."""
+        return HitachiProjectorOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Handle the initial step."""
+        return self.async_show_menu(step_id="user", menu_options=["manual", "scan"])
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle a projector entered by address."""
         errors: dict[str, str] = {}
         if user_input is not None:
+            self._async_abort_entries_match({CONF_HOST: user_input[CONF_HOST]})
             try:
                 info = await validate_input(self.hass, user_input)
             except CannotConnect:
@@ -95,7 +143,180 @@ class HitachiProjectorConfigFlow(ConfigFlow, domain=DOMAIN):
             }
         )
         return self.async_show_form(
-            step_id="user", data_schema=data_schema, errors=errors
+            step_id="manual", data_schema=data_schema, errors=errors
+        )
+
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Scan a network for projectors."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                network = ip_network(user_input[CONF_NETWORK], strict=False)
+            except ValueError:
+                errors[CONF_NETWORK] = "invalid_network"
+            else:
+                if (
+                    not isinstance(network, IPv4Network)
+                    or network.num_addresses > DISCOVERY_MAX_HOSTS
+                ):
+                    errors[CONF_NETWORK] = "network_too_large"
+                else:
+                    self._password = user_input.get(CONF_PASSWORD, "")
+                    configured = {
+                        entry.data[CONF_HOST]
+                        for entry in self._async_current_entries(include_ignore=False)
+                    }
+                    self._discovered = {
+                        projector.host: projector
+                        for projector in await async_discover_projectors(
+                            network, self._password or None
+                        )
+                        if projector.host not in configured
+                    }
+                    if self._discovered:
+                        return await self.async_step_pick()
+                    errors["base"] = "no_devices_found"
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_NETWORK,
+                    default=user_input.get(CONF_NETWORK) if user_input else None,
+                ): str,
+                vol.Optional(
+                    CONF_PASSWORD,
+                    default=user_input.get(CONF_PASSWORD, "") if user_input else "",
+                ): str,
+            }
+        )
+        return self.async_show_form(
+            step_id="scan",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders={"max_hosts": str(DISCOVERY_MAX_HOSTS)},
+        )
+
+    async def async_step_pick(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Pick the projectors found by the scan to set up."""
+        errors: dict[str, str] = {}
+        placeholders = {"hosts": ""}
+        if user_input is not None:
+            hosts: list[str] = user_input[CONF_HOSTS]
+            if not hosts:
+                errors["base"] = "no_selection"
+            elif failed := await self._async_failed_hosts(hosts):
+                errors["base"] = "setup_failed"
+                placeholders["hosts"] = ", ".join(failed)
+            else:
+                # Every other projector gets a flow of its own, as a flow can
+                # only create one entry
+                for host in hosts[1:]:
+                    self.hass.async_create_task(
+                        self.hass.config_entries.flow.async_init(
+                            DOMAIN,
+                            context={"source": SOURCE_INTEGRATION_DISCOVERY},
+                            data={
+                                CONF_HOST: host,
+                                CONF_PASSWORD: self._password,
+                                CONF_TITLE: self._title(host),
+                            },
+                        )
+                    )
+                return self.async_create_entry(
+                    title=self._title(hosts[0]),
+                    data={CONF_HOST: hosts[0], CONF_PASSWORD: self._password},
+                )
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_HOSTS, default=list(self._discovered)
+                ): cv.multi_select(
+                    {
+                        host: projector.label
+                        for host, projector in self._discovered.items()
+                    }
+                ),
+            }
+        )
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders=placeholders,
+        )
+
+    async def async_step_integration_discovery(
+        self, discovery_info: dict[str, Any]
+    ) -> ConfigFlowResult:
+        """Set up a projector picked from a network scan in another flow."""
+        self._async_abort_entries_match({CONF_HOST: discovery_info[CONF_HOST]})
+        return self.async_create_entry(
+            title=discovery_info[CONF_TITLE],
+            data={
+                CONF_HOST: discovery_info[CONF_HOST],
+                CONF_PASSWORD: discovery_info[CONF_PASSWORD],
+            },
+        )
+
+    async def _async_failed_hosts(self, hosts: list[str]) -> list[str]:
+        """Return the hosts that cannot be connected to or authenticated with."""
+        results = await asyncio.gather(
+            *(
+                validate_input(
+                    self.hass, {CONF_HOST: host, CONF_PASSWORD: self._password}
+                )
+                for host in hosts
+            ),
+            return_exceptions=True,
+        )
+        return [
+            host
+            for host, result in zip(hosts, results, strict=True)
+            if isinstance(result, Exception)
+        ]
+
+    def _title(self, host: str) -> str:
+        """Return the entry title of a discovered projector."""
+        if (projector := self._discovered.get(host)) and projector.name:
+            return projector.name
+        return TITLE
+
+
+class HitachiProjectorOptionsFlow(OptionsFlow):
+    """Handle options for Hitachi Projector."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the replacement and debug options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_LAMP_LIFE, default=DEFAULT_LAMP_LIFE): vol.All(
+                    vol.Coerce(int), vol.Range(min=1)
+                ),
+                vol.Required(CONF_FILTER_LIFE, default=DEFAULT_FILTER_LIFE): vol.All(
+                    vol.Coerce(int), vol.Range(min=1)
+                ),
+                vol.Required(CONF_DEBUG_PROFILING, default=False): bool,
+                vol.Required(
+                    CONF_PROFILE_THRESHOLD,
+                    default=int(DEFAULT_PROFILE_THRESHOLD * 1000),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            }
+        )
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                data_schema, self.config_entry.options
+            ),
         )
 
 
@@ -0,0 +1,452 @@
+"""Persistent session to the Hitachi projector control port."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+import logging
+import socket
+import struct
+import time
+from typing import Any
+
+from libhitachiprojector.hitachiprojector import (
+    PORT,
+    Command,
+    ReplyType,
+    build_auth_digest,
+)
+
+from .const import (
+    CONNECT_TIMEOUT,
+    KEEPALIVE_INTERVAL,
+    RECONNECT_BACKOFF_MAX,
+    RECONNECT_BACKOFF_MIN,
+    REPLY_TIMEOUT,
+    SESSION_IDLE_TIMEOUT,
+)
+from .profiler import HitachiProjectorProfiler
+from .registers import FRAMES, REGISTERS, HitachiProjectorRegister
+from .stats import HitachiProjectorStats
+
+_LOGGER = logging.getLogger(__name__)
+
+AUTH_NONCE_LENGTH = 8
+AUTH_FAILURE_REPLY = bytes([0x1F, 0x04, 0x00])
+
+# Replies are a few bytes, anything beyond this is garbage and dropped
+REPLY_BUFFER_SIZE = 256
+
+PACKET_HEADER = bytes([0x02, 0x0D])
+
+_COMMAND_NAMES = {frame: command.value for command, frame in FRAMES.items()}
+_CONNECTION_IDS = [bytes([connection_id]) for connection_id in range(256)]
+_REPLY_TYPES = {reply_type.value: reply_type for reply_type in ReplyType}
+_BUSY_AUTH = 0x0400
+_REPLY_STATUS = struct.Struct(">H")
+
+
+def _packet(frame: bytes, digest: bytes | None) -> bytes:
+    """Return the packet of a frame, without its connection id."""
+    packet = (digest or b"") + PACKET_HEADER + frame
+    return packet + bytes([255 - ((packet[0] + packet[1] + packet[-1]) & 0xFF)])
+
+
+# Packets of every known frame before authentication
+_PACKETS = {frame: _packet(frame, None) for frame in FRAMES.values()}
+
+
+class HitachiProjectorProtocol(asyncio.BufferedProtocol):
+    """Receive replies into one buffer reused for every frame."""
+
+    def __init__(self) -> None:
+        """Initialize the protocol."""
+        self._buffer = memoryview(bytearray(REPLY_BUFFER_SIZE))
+        self._length = 0
+        self._waiter: asyncio.Future[None] | None = None
+        self._closed = asyncio.get_running_loop().create_future()
+        self._error: Exception | None = None
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        """Return the free part of the buffer."""
+        if self._length == REPLY_BUFFER_SIZE:
+            self._length = 0
+        return self._buffer[self._length :]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        """Wake up the reader of a reply."""
+        self._length += nbytes
+        self._wake()
+
+    def eof_received(self) -> bool:
+        """Close the connection when the projector does."""
+        self._error = ConnectionResetError("Connection closed by projector")
+        self._wake()
+        return False
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Fail the reader of a reply."""
+        if self._error is None:
+            self._error = exc or ConnectionResetError("Connection closed")
+        self._wake()
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+    def clear(self) -> None:
+        """Drop what was received, ahead of a new frame."""
+        self._length = 0
+
+    async def async_receive(self, length: int = 0) -> memoryview:
+        """Wait until more than a length was received, and return all of it.
+
+        The returned view is only valid until the next frame is sent.
+        """
+        while self._length <= length:
+            if self._error is not None:
+                raise self._error
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._buffer[: self._length]
+
+    async def async_wait_closed(self) -> None:
+        """Wait until the connection is closed."""
+        await self._closed
+
+    def _wake(self) -> None:
+        """Resume the reader of a reply."""
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+
+class HitachiProjectorSession:
+    """Long-lived, authenticated connection to a Hitachi projector.
+
+    Frames are serialized over a single socket. The socket is opened on demand,
+    kept alive while in use, closed after being idle for a while and reopened
+    with exponential backoff after a failure.
+    """
+
+    host: str
+    password: str | None
+
+    def __init__(
+        self,
+        host: str,
+        password: str | None,
+        port: int = PORT,
+        stats: HitachiProjectorStats | None = None,
+        profiler: HitachiProjectorProfiler | None = None,
+    ) -> None:
+        """Initialize the session."""
+        self.host = host
+        self.password = password
+        self.port = port
+        self.stats = stats or HitachiProjectorStats()
+        self.profiler = profiler or HitachiProjectorProfiler()
+
+        self._lock = asyncio.Lock()
+        self._transport: asyncio.Transport | None = None
+        self._protocol: HitachiProjectorProtocol | None = None
+        self._digest: bytes | None = None
+        self._packets = _PACKETS
+        self._connection_id = 0
+        self._authenticated = False
+
+        self._backoff = RECONNECT_BACKOFF_MIN
+        self._next_connect = 0.0
+        # Whether the next connect recovers from a failure or a dropped socket
+        self._lost = False
+
+        self._last_activity = 0.0
+        self._last_frame = 0.0
+        self._next_use = 0.0
+        self._maintenance: asyncio.TimerHandle | None = None
+        self._keepalive_task: asyncio.Task | None = None
+
+    @property
+    def connected(self) -> bool:
+        """Return if the socket is currently open."""
+        return self._transport is not None and not self._transport.is_closing()
+
+    async def async_send_cmd(
+        self, cmd: bytes, parse: Callable[[memoryview], Any] | None = None
+    ) -> tuple:
+        """Send a command frame and return the reply.
+
+        The data of a data reply is parsed while the receive buffer holds it,
+        other reply data is returned as bytes.
+        """
+        call = _COMMAND_NAMES.get(cmd, "unknown")
+        return await self.profiler.wrap(call, self._async_send_cmd(cmd, call, parse))
+
+    async def _async_send_cmd(
+        self, cmd: bytes, call: str, parse: Callable[[memoryview], Any] | None
+    ) -> tuple:
+        """Send a command frame, recording its latency and outcome."""
+        async with self._lock:
+            start = self._last_activity = time.monotonic()
+            self._next_use = 0.0
+            try:
+                reply_type, data = await self._async_exchange(cmd)
+            except (OSError, RuntimeError) as err:
+                self.stats.record(
+                    call,
+                    time.monotonic() - start,
+                    failed=True,
+                    timed_out=isinstance(err, TimeoutError),
+                )
+                raise
+
+            self.stats.record(
+                call,
+                time.monotonic() - start,
+                failed=reply_type not in (ReplyType.ACK, ReplyType.DATA),
+            )
+            if data is None:
+                return reply_type, None
+            if parse is not None and reply_type is ReplyType.DATA:
+                return reply_type, parse(data)
+            return reply_type, bytes(data)
+
+    async def async_close(self) -> None:
+        """Close the session and stop keep-alive."""
+        if self._maintenance is not None:
+            self._maintenance.cancel()
+            self._maintenance = None
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        async with self._lock:
+            await self._async_disconnect()
+
+    def expect_next_use(self, delay: float) -> None:
+        """Tell the session when it is next needed, in seconds from now.
+
+        If it would be idle by then, it is closed right away instead of being
+        kept alive in between. Any frame sent meanwhile cancels the hint.
+        """
+        self._next_use = time.monotonic() + delay
+        if self.connected and self._idle_before_next_use():
+            self._schedule_maintenance(0)
+
+    @asynccontextmanager
+    async def async_suspend(self) -> AsyncIterator[None]:
+        """Keep the socket closed, so another connection may use the projector."""
+        async with self._lock:
+            await self._async_disconnect()
+            yield
+
+    async def async_read(self, register: HitachiProjectorRegister) -> tuple:
+        """Read a status register and return the reply with its parsed value."""
+        return await self.async_send_cmd(FRAMES[register.get_command], register.parse)
+
+    async def get_power_status(self) -> tuple:
+        """Get the power status."""
+        return await self.async_read(REGISTERS["power_status"])
+
+    async def _async_exchange(self, cmd: bytes) -> tuple:
+        """Send a frame over the session, reconnecting once if it went stale."""
+        reused = self.connected
+        if not reused and self._transport is not None:
+            # Closed by the projector since the last frame
+            self._lost = True
+        try:
+            if not reused:
+                await self._async_connect()
+            return await self._async_send_frame(cmd)
+        except (OSError, RuntimeError) as err:
+            await self._async_disconnect(lost=True)
+            if not reused or isinstance(err, RuntimeError):
+                raise
+            _LOGGER.debug("Session to %s went stale, reconnecting", self.host)
+
+        await self._async_connect()
+        try:
+            return await self._async_send_frame(cmd)
+        except (OSError, RuntimeError):
+            await self._async_disconnect(lost=True)
+            raise
+
+    async def _async_connect(self) -> None:
+        """Open the socket, honoring the reconnect backoff."""
+        now = time.monotonic()
+        if now < self._next_connect:
+            raise ConnectionError(
+                f"Backing off reconnect to {self.host} for "
+                f"{self._next_connect - now:.1f}s"
+            )
+
+        _LOGGER.debug("Connecting to %s:%s", self.host, self.port)
+        try:
+            async with asyncio.timeout(CONNECT_TIMEOUT):
+                (
+                    self._transport,
+                    self._protocol,
+                ) = await asyncio.get_running_loop().create_connection(
+                    HitachiProjectorProtocol, self.host, self.port
+                )
+        except OSError:
+            self._lost = True
+            self._next_connect = time.monotonic() + self._backoff
+            self._backoff = min(self._backoff * 2, RECONNECT_BACKOFF_MAX)
+            raise
+
+        if (sock := self._transport.get_extra_info("socket")) is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+        self.stats.connects += 1
+        if self._lost:
+            self.stats.reconnects += 1
+            self._lost = False
+        self._backoff = RECONNECT_BACKOFF_MIN
+        self._next_connect = 0.0
+        self._digest = None
+        self._packets = _PACKETS
+        self._authenticated = False
+        self._schedule_maintenance()
+
+    async def _async_disconnect(self, lost: bool = False) -> None:
+        """Close the socket if it is open.
+
+        Lost is set when closing after a failure, rather than because the
+        session is idle or suspended, so the next connect counts as a
+        reconnect.
+        """
+        self._lost = self._lost or lost
+        transport, protocol = self._transport, self._protocol
+        self._transport = self._protocol = None
+        self._digest = None
+        self._packets = _PACKETS
+        self._authenticated = False
+        if transport is None or protocol is None:
+            return
+
+        _LOGGER.debug("Disconnecting from %s", self.host)
+        transport.close()
+        await protocol.async_wait_closed()
+
+    async def _async_send_frame(self, cmd: bytes) -> tuple:
+        """Write a frame and read its reply, authenticating on first use."""
+        connection_id = self._next_connection_id()
+        reply = await self._async_write_read(cmd, connection_id)
+
+        if not self._authenticated:
+            # An auth enabled projector sends a nonce, then rejects the first
+            # frame. Both may arrive in the same read.
+            if len(reply) == AUTH_NONCE_LENGTH:
+                reply = await self._async_read(AUTH_NONCE_LENGTH)
+            if (
+                len(reply) == AUTH_NONCE_LENGTH + len(AUTH_FAILURE_REPLY) + 1
+                and reply[AUTH_NONCE_LENGTH:-1] == AUTH_FAILURE_REPLY
+            ):
+                if reply[-1] != connection_id:
+                    raise RuntimeError("Unexpected auth failure response")
+                if self.password is None:
+                    raise RuntimeError("Auth required but missing password")
+
+                self._digest = build_auth_digest(
+                    bytes(reply[:AUTH_NONCE_LENGTH]), self.password
+                )
+                self._packets = {}
+                connection_id = self._next_connection_id()
+                reply = await self._async_write_read(cmd, connection_id)
+            self._authenticated = True
+
+        self._last_frame = time.monotonic()
+
+        if reply[-1] != connection_id:
+            raise RuntimeError(
+                f"Received reply for other connection: {connection_id} != {reply[-1]}"
+            )
+        if (reply_type := _REPLY_TYPES.get(reply[0])) is None:
+            raise RuntimeError(f"Unexpected reply: {reply.hex()}")
+
+        if reply_type in (ReplyType.ACK, ReplyType.NACK):
+            return reply_type, None
+        if reply_type is ReplyType.BUSY and (
+            _REPLY_STATUS.unpack_from(reply, 1)[0] == _BUSY_AUTH
+        ):
+            self.stats.auth_failures += 1
+            # Start over with a fresh handshake on the next frame
+            await self._async_disconnect(lost=True)
+            return ReplyType.AUTH, None
+        return reply_type, reply[1:3]
+
+    async def _async_write_read(self, cmd: bytes, connection_id: int) -> memoryview:
+        """Write the packet of a frame, then read its reply."""
+        assert self._transport is not None and self._protocol is not None
+
+        if (packet := self._packets.get(cmd)) is None:
+            # Authenticated packets, and the packets of unknown frames
+            packet = self._packets[cmd] = _packet(cmd, self._digest)
+        self._protocol.clear()
+        self._transport.write(packet + _CONNECTION_IDS[connection_id])
+        return await self._async_read()
+
+    async def _async_read(self, length: int = 0) -> memoryview:
+        """Read until more than a length was received."""
+        assert self._protocol is not None
+
+        async with asyncio.timeout(REPLY_TIMEOUT):
+            return await self._protocol.async_receive(length)
+
+    def _next_connection_id(self) -> int:
+        """Return the connection id of the next frame."""
+        self._connection_id = (self._connection_id + 1) & 0xFF
+        return self._connection_id
+
+    def _schedule_maintenance(
+        self, delay: float = KEEPALIVE_INTERVAL.total_seconds()
+    ) -> None:
+        """Schedule the next keep-alive or idle check."""
+        if self._maintenance is not None:
+            self._maintenance.cancel()
+        self._maintenance = asyncio.get_running_loop().call_later(delay, self._maintain)
+
+    def _idle_before_next_use(self) -> bool:
+        """Return if the session goes idle before it is next needed."""
+        return (
+            self._next_use > self._last_activity + SESSION_IDLE_TIMEOUT.total_seconds()
+        )
+
+    def _maintain(self) -> None:
+        """Close an idle session, or keep an active one alive."""
+        self._maintenance = None
+        if not self.connected:
+            return
+
+        now = time.monotonic()
+        if (
+            now - self._last_activity >= SESSION_IDLE_TIMEOUT.total_seconds()
+            or self._idle_before_next_use()
+        ):
+            self._keepalive_task = asyncio.create_task(self._async_maintain(idle=True))
+            return
+
+        if now - self._last_frame >= KEEPALIVE_INTERVAL.total_seconds():
+            self._keepalive_task = asyncio.create_task(self._async_maintain(idle=False))
+        self._schedule_maintenance()
+
+    async def _async_maintain(self, idle: bool) -> None:
+        """Close an idle socket, or send a harmless query to keep it open."""
+        if self._lock.locked():
+            if idle:
+                # In use after all, check again later
+                self._schedule_maintenance()
+            return
+        async with self._lock:
+            if not self.connected:
+                return
+            if idle:
+                _LOGGER.debug("Session to %s idle, closing", self.host)
+                await self._async_disconnect()
+                return
+            try:
+                await self._async_send_frame(FRAMES[Command.PowerGet])
+            except (OSError, RuntimeError) as err:
+                _LOGGER.debug("Keep-alive to %s failed: %s", self.host, err)
+                await self._async_disconnect(lost=True)
@@ -1,5 +1,7 @@
 """Constants for the Hitachi Projector integration."""
 
+from datetime import timedelta
+
 from libhitachiprojector.hitachiprojector import (
     Command,
     ErrorStatus,
@@ -11,6 +13,113 @@ from homeassistant.components.media_player import MediaPlayerState
 
 DOMAIN = "hitachiprojector"
 
+CONF_DEVICE_INFO = "device_info"
+CONF_CAPABILITIES = "capabilities"
+
+# Fired with the statuses that changed, whenever a poll or command changes any
+EVENT_STATE_CHANGED = f"{DOMAIN}_state_changed"
+
+# Poll cycle interval, picked from the power state after every cycle
+POLL_INTERVAL_ON = timedelta(seconds=10)
+POLL_INTERVAL_OFF = timedelta(minutes=2)
+POLL_INTERVAL_BOOST = timedelta(seconds=2)
+# How long to poll at the boost interval after a command was sent
+POLL_BOOST_DURATION = timedelta(seconds=20)
+
+# Consecutive failed polls before the projector is considered unreachable.
+# It is then only probed, with a backoff doubling from min to max.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BACKOFF_MIN = timedelta(seconds=30)
+BREAKER_BACKOFF_MAX = timedelta(minutes=10)
+
+# Rejected reads of a status, in polls at least the spacing apart, before the
+# model is considered not to support it. Projectors also reject reads for a
+# moment, such as while they change input.
+PROBE_REJECTIONS = 3
+PROBE_REJECTION_SPACING = timedelta(seconds=10)
+
+# Minimum age of each status before it is read again while the projector is
+# on. Power is read every cycle. While off or cooling down only power is read.
+REGISTER_REFRESH_INTERVALS = {
+    "input_source": timedelta(0),
+    "blank_status": timedelta(0),
+    "error_status": timedelta(0),
+    "eco_mode_status": timedelta(minutes=5),
+    "auto_eco_mode_status": timedelta(minutes=5),
+    "filter_time": timedelta(minutes=30),
+    "lamp_time": timedelta(minutes=30),
+    "mute_status": timedelta(seconds=30),
+    "freeze_status": timedelta(seconds=30),
+    "volume": timedelta(minutes=1),
+    "picture_mode": timedelta(minutes=5),
+}
+
+# Projectors polled at the same time across all config entries, and the
+# window over which fleet poll latency is reported
+FLEET_MAX_CONCURRENT_POLLS = 8
+FLEET_CYCLE = POLL_INTERVAL_ON
+# Window the first polls after a start are spread over
+FLEET_STARTUP_WINDOW = POLL_INTERVAL_ON
+
+# Persistent session to the Hitachi control port, timeouts in seconds
+CONNECT_TIMEOUT = 5.0
+REPLY_TIMEOUT = 5.0
+RECONNECT_BACKOFF_MIN = 1.0
+RECONNECT_BACKOFF_MAX = 60.0
+KEEPALIVE_INTERVAL = timedelta(seconds=20)
+# Shorter than POLL_INTERVAL_OFF so the socket is released while the
+# projector is off instead of being kept alive between sparse polls
+SESSION_IDLE_TIMEOUT = timedelta(minutes=1)
+
+# Minimum time between two commands sent to a projector, in seconds
+COMMAND_INTERVAL = 0.2
+
+# How long a scene keeps retrying rejected commands after changing power,
+# while the projector warms up or cools down, and how often, in seconds
+SCENE_WARMUP_TIMEOUT = 60.0
+SCENE_RETRY_INTERVAL = 2.0
+
+# Projectors a broadcast command is sent to at the same time, and how often
+# and how far apart it is tried on each, in seconds
+BROADCAST_CONCURRENCY = 16
+BROADCAST_ATTEMPTS = 3
+BROADCAST_RETRY_DELAY = 1.0
+
+# PJLink timeout in seconds, applied to connecting and to each query
+PJLINK_TIMEOUT = 2.0
+
+# Network scan limits. Hosts are probed concurrently up to the limit, each
+# with a short timeout, and scanned networks may not exceed the host count.
+DISCOVERY_CONCURRENCY = 128
+DISCOVERY_TIMEOUT = 1.0
+DISCOVERY_MAX_HOSTS = 1024
+
+# Days of lamp and filter counter samples kept per projector, and how long
+# to collect changes before saving them, in seconds
+USAGE_HISTORY_DAYS = 30
+USAGE_SAVE_DELAY = 600
+
+# Longest a changed status snapshot waits to be saved, in seconds
+SNAPSHOT_SAVE_DELAY = 60
+
+# Hours after which the lamp and filter are due for replacement. Defaults
+# are common for Hitachi models, the manual lists the actual values.
+CONF_LAMP_LIFE = "lamp_life"
+CONF_FILTER_LIFE = "filter_life"
+DEFAULT_LAMP_LIFE = 3000
+DEFAULT_FILTER_LIFE = 5000
+
+# Debug profiling options, the threshold is in milliseconds
+CONF_DEBUG_PROFILING = "debug_profiling"
+CONF_PROFILE_THRESHOLD = "profile_threshold"
+
+# Time a call may hold the event loop before its profile is kept, in seconds
+DEFAULT_PROFILE_THRESHOLD = 0.05
+
+# Number of slow call profiles kept, and functions listed in each
+PROFILE_HISTORY = 20
+PROFILE_TOP_FUNCTIONS = 25
+
 POWER_STATUS_TO_MEDIA_PLAYER_STATE = {
     PowerStatus.On: MediaPlayerState.ON,
     PowerStatus.Off: MediaPlayerState.OFF,
@@ -26,7 +135,21 @@ SOURCE_TO_SET_COMMAND = {
     InputSource.Video.name: Command.InputSourceVideo,
     InputSource.USBTypeA.name: Command.InputSourceUSBTypeA,
     InputSource.LAN.name: Command.InputSourceLAN,
-    InputSource.USBTypeA.name: Command.InputSourceUSBTypeA,
+    InputSource.USBTypeB.name: Command.InputSourceUSBTypeB,
+}
+
+# PJLink input numbers reported by Hitachi projectors, used to tell which
+# sources a model has
+PJLINK_INPUT_TO_SOURCE = {
+    "11": InputSource.ComputerIn1.name,
+    "12": InputSource.ComputerIn2.name,
+    "13": InputSource.Component.name,
+    "21": InputSource.Video.name,
+    "22": InputSource.SVideo.name,
+    "31": InputSource.HDMI.name,
+    "41": InputSource.USBTypeA.name,
+    "42": InputSource.USBTypeB.name,
+    "51": InputSource.LAN.name,
 }
 
 ERROR_STATUS_OPTIONS = [
@@ -46,6 +169,6 @@ ERROR_STATUS_TO_OPTION = {
     ErrorStatus.Lamp: "lamp",
     ErrorStatus.Temp: "temp",
     ErrorStatus.AirFlow: "airflow",
-    ErrorStatus.Cold: "Cold",
+    ErrorStatus.Cold: "cold",
     ErrorStatus.Filter: "filter",
 }
@@ -0,0 +1,473 @@
+"""Data update coordinator for the Hitachi Projector integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, fields, replace
+from datetime import timedelta
+from enum import Enum
+import logging
+import time
+from typing import Any
+
+from libhitachiprojector.hitachiprojector import (
+    AutoEcoModeStatus,
+    BlankStatus,
+    EcoModeStatus,
+    ErrorStatus,
+    InputSource,
+    PowerStatus,
+    ReplyType,
+)
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    BREAKER_BACKOFF_MAX,
+    BREAKER_BACKOFF_MIN,
+    BREAKER_FAILURE_THRESHOLD,
+    DOMAIN,
+    EVENT_STATE_CHANGED,
+    POLL_BOOST_DURATION,
+    POLL_INTERVAL_BOOST,
+    POLL_INTERVAL_OFF,
+    POLL_INTERVAL_ON,
+    PROBE_REJECTION_SPACING,
+    PROBE_REJECTIONS,
+    REGISTER_REFRESH_INTERVALS,
+)
+from .fleet import HitachiProjectorFleet
+from .profiler import HitachiProjectorProfiler
+from .registers import REGISTERS, FreezeStatus, MuteStatus, PictureMode
+from .transport import HitachiProjectorTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HitachiProjectorData:
+    """Snapshot of every projector status fetched in one poll cycle."""
+
+    power_status: PowerStatus
+    input_source: InputSource | None = None
+    error_status: ErrorStatus | None = None
+    filter_time: int | None = None
+    lamp_time: int | None = None
+    blank_status: BlankStatus | None = None
+    eco_mode_status: EcoModeStatus | None = None
+    auto_eco_mode_status: AutoEcoModeStatus | None = None
+    mute_status: MuteStatus | None = None
+    freeze_status: FreezeStatus | None = None
+    volume: int | None = None
+    picture_mode: PictureMode | None = None
+
+
+class HitachiProjectorCoordinator(DataUpdateCoordinator[HitachiProjectorData]):
+    """Fetch projector statuses in one cycle and share them with entities.
+
+    Power is read every cycle. Other statuses are read until the model
+    answered them once or rejected them in several polls, which probes
+    whether it supports them. After that they are only read
+    while an entity listens for them and once they are older than their
+    refresh interval, statuses no entity shows keep their last value. The
+    cycle interval itself follows the power state.
+
+    Listeners pass the statuses they show as their context, and are only
+    updated when one of those changed.
+
+    A few failed polls in a row mark the projector unreachable. Until it
+    answers again only power is probed, with a growing backoff, then every
+    status is read again.
+    """
+
+    config_entry: ConfigEntry
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        transport: HitachiProjectorTransport,
+        fleet: HitachiProjectorFleet,
+        profiler: HitachiProjectorProfiler,
+        supported_registers: Iterable[str] | None = None,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=DOMAIN,
+            update_interval=POLL_INTERVAL_ON,
+        )
+        self.transport = transport
+        self.fleet = fleet
+        self.profiler = profiler
+        self.supported_registers = (
+            set(supported_registers) if supported_registers is not None else None
+        )
+
+        self._probed: dict[str, bool] = {}
+        self._rejections: dict[str, tuple[int, float]] = {}
+        self._notified_data: HitachiProjectorData | None = None
+        self._notified_success = True
+        self._announced: dict[str, Any] = {}
+        self._read: set[str] = set()
+        self._last_read: dict[str, float] = {}
+        self._stale: set[str] = set()
+        self._boost_until = 0.0
+        self._failures = 0
+        self._breaker_backoff: timedelta | None = None
+        self.restored = False
+
+    @callback
+    def async_restore(self, data: HitachiProjectorData, ages: dict[str, float]) -> None:
+        """Start from the statuses of a previous run, read the given seconds ago.
+
+        Statuses read within their refresh interval are not polled again
+        until it passed, and no change is announced for the restored ones.
+        The statuses count as restored until the projector answered a poll.
+        """
+        self.data = self._notified_data = data
+        self._announced = {
+            name: value for name, value in vars(data).items() if value is not None
+        }
+        self.restored = True
+        now = time.monotonic()
+        for register, age in ages.items():
+            if register in REGISTER_REFRESH_INTERVALS:
+                self._last_read[register] = now - age
+
+    def status_ages(self) -> dict[str, float]:
+        """Return how many seconds ago every status was read."""
+        now = time.monotonic()
+        return {register: now - read for register, read in self._last_read.items()}
+
+    def is_fresh(self, register: str) -> bool:
+        """Return if a status was read recently enough to act on its cached value.
+
+        That is within its refresh interval and the poll cycle following it,
+        and not since a command or power change left it stale.
+        """
+        if self.restored or register in self._stale:
+            return False
+        if (read := self._last_read.get(register)) is None:
+            return False
+        window = REGISTER_REFRESH_INTERVALS.get(register, timedelta(0)) + (
+            self.update_interval or POLL_INTERVAL_ON
+        )
+        return time.monotonic() - read <= window.total_seconds()
+
+    async def async_read_status(self, register: str) -> Any:
+        """Read a single status right away and share it if it changed.
+
+        Returns None if the projector did not report the status.
+        """
+        con = self.transport
+        try:
+            reply = await con.async_read(REGISTERS[register])
+        except (RuntimeError, OSError, ValueError) as err:
+            _LOGGER.debug("Unable to read %s from %s: %s", register, con.host, err)
+            self._stale.add(register)
+            return None
+
+        if (value := _data_or_none(reply)) is None:
+            self._stale.add(register)
+            return None
+
+        self._last_read[register] = time.monotonic()
+        self._stale.discard(register)
+        self._read.add(register)
+        if register == "power_status" and value == PowerStatus.On:
+            self._stale.update(REGISTER_REFRESH_INTERVALS)
+        if self.data is not None and getattr(self.data, register) != value:
+            self.async_set_updated_data(replace(self.data, **{register: value}))
+        elif value != self._announced.get(register):
+            # Confirms a status applied when its command was acknowledged
+            self.async_update_listeners()
+        return value
+
+    async def async_command_acknowledged(self, register: str, value: Any) -> None:
+        """Apply the status a command set, then confirm it with a single read.
+
+        The status is rolled back to what the projector reports if the read-back
+        disagrees. Polling also runs fast for a while to follow up on any side
+        effects, such as power warm-up.
+        """
+        self._boost_until = time.monotonic() + POLL_BOOST_DURATION.total_seconds()
+        self.update_interval = POLL_INTERVAL_BOOST
+        if self.data is None:
+            # Sent before the first poll, which reads every status anyway
+            self._stale.add(register)
+            return
+        self.async_set_updated_data(replace(self.data, **{register: value}))
+
+        confirmed = await self.async_read_status(register)
+        if confirmed is not None and confirmed != value:
+            _LOGGER.debug(
+                "%s reported %s=%s after command, expected %s",
+                self.transport.host,
+                register,
+                confirmed,
+                value,
+            )
+
+    @property
+    def unreachable(self) -> bool:
+        """Return if the projector stopped answering and is only probed."""
+        return self._breaker_backoff is not None
+
+    @property
+    def probed_registers(self) -> set[str] | None:
+        """Return the statuses the projector answered, once every one was tried."""
+        if len(self._probed) < len(REGISTER_REFRESH_INTERVALS):
+            return None
+        return {register for register, supported in self._probed.items() if supported}
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners of changed statuses and announce the changes."""
+        self.profiler.run_callback("update_entities", self._async_notify_changes)
+
+    @callback
+    def _async_notify_changes(self) -> None:
+        """Update the listeners of changed statuses and announce the changes.
+
+        Only values read from the projector are announced, so the status an
+        acknowledged command applied is announced once read back, and a
+        status that became unknown is not announced at all.
+        """
+        previous = self._notified_data
+        changes = _changed_fields(previous, self.data)
+        read, self._read = self._read, set()
+        availability_changed = self._notified_success != self.last_update_success
+        self._notified_data = self.data
+        self._notified_success = self.last_update_success
+
+        for update_callback, context in list(self._listeners.values()):
+            # Listeners without a context follow every update
+            if (
+                context is None
+                or availability_changed
+                or not changes.keys().isdisjoint(context)
+            ):
+                update_callback()
+
+        if self.data is None:
+            return
+        announced = {
+            field.name: value
+            for field in fields(self.data)
+            if field.name in read
+            and (value := getattr(self.data, field.name)) is not None
+            and value != self._announced.get(field.name)
+        }
+        self._announced.update(announced)
+        if previous is not None and announced:
+            self._async_fire_state_changed(announced)
+
+    @callback
+    def _async_fire_state_changed(self, changes: dict[str, Any]) -> None:
+        """Fire an event carrying the statuses that changed."""
+        event_data: dict[str, Any] = {
+            "config_entry_id": self.config_entry.entry_id,
+            **{
+                register: value.name if isinstance(value, Enum) else value
+                for register, value in changes.items()
+            },
+        }
+        if device := dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, self.config_entry.entry_id)}
+        ):
+            event_data["device_id"] = device.id
+        self.hass.bus.async_fire(EVENT_STATE_CHANGED, event_data)
+
+    async def _async_update_data(self) -> HitachiProjectorData:
+        """Fetch the power status and every other status that is due."""
+        return await self.profiler.wrap("poll", self._async_poll())
+
+    async def _async_poll(self) -> HitachiProjectorData:
+        """Fetch the statuses within a fleet poll slot."""
+        try:
+            async with self.fleet.async_poll_slot():
+                power_status, updates = await self._async_fetch()
+        except UpdateFailed as err:
+            self._failures += 1
+            if self.data is not None and self._failures < BREAKER_FAILURE_THRESHOLD:
+                # Ride out a single missed reply with the statuses already known
+                _LOGGER.debug(
+                    "Poll of %s failed %s times: %s",
+                    self.transport.host,
+                    self._failures,
+                    err,
+                )
+                return self.data
+            self._trip_breaker()
+            raise
+
+        self._failures = 0
+        self.restored = False
+        self._read.update(("power_status", *updates))
+
+        self.update_interval = self.fleet.align_interval(
+            self.config_entry.entry_id, self._next_interval(power_status)
+        )
+        # Rather than kept alive until the next poll, a session that would be
+        # idle by then is closed right away
+        self.transport.expect_next_use(self.update_interval.total_seconds())
+
+        if self.data is None:
+            return HitachiProjectorData(power_status=power_status, **updates)
+        return replace(self.data, power_status=power_status, **updates)
+
+    async def _async_fetch(self) -> tuple[PowerStatus, dict[str, Any]]:
+        """Read the power status and every other status that is due."""
+        con = self.transport
+
+        try:
+            reply_type, power_status = await con.async_read(REGISTERS["power_status"])
+            if reply_type != ReplyType.DATA or power_status is None:
+                raise UpdateFailed("Unexpected reply type")
+            self._last_read["power_status"] = time.monotonic()
+            self._stale.discard("power_status")
+
+            if self._breaker_backoff is not None:
+                _LOGGER.debug("%s answers again", con.host)
+                self._breaker_backoff = None
+                self._stale.update(REGISTER_REFRESH_INTERVALS)
+
+            if power_status == PowerStatus.On and (
+                self.data is None or self.data.power_status != PowerStatus.On
+            ):
+                # Anything may have changed while the projector was off
+                self._stale.update(REGISTER_REFRESH_INTERVALS)
+
+            updates: dict[str, Any] = {}
+            for register in self._due_registers(power_status):
+                try:
+                    reply = await con.async_read(REGISTERS[register])
+                except ValueError as err:
+                    # Supported, but set to a value without a name here
+                    _LOGGER.debug(
+                        "Unable to parse %s of %s: %s", register, con.host, err
+                    )
+                    reply = (ReplyType.DATA, None)
+                if power_status == PowerStatus.On and reply[0] in _PROBE_REPLIES:
+                    self._record_probe(register, reply[0] == ReplyType.DATA)
+                if (
+                    reply[0] != ReplyType.DATA
+                    and self._probed.get(register) is not False
+                ):
+                    # May only last a moment, keep the value and read it next poll
+                    continue
+                updates[register] = _data_or_none(reply)
+                self._last_read[register] = time.monotonic()
+                self._stale.discard(register)
+        except (RuntimeError, OSError) as err:
+            raise UpdateFailed(f"Unable to connect to {con.host}") from err
+
+        return power_status, updates
+
+    def _trip_breaker(self) -> None:
+        """Stop regular polls and probe with a growing backoff instead."""
+        if self._breaker_backoff is None:
+            self._breaker_backoff = BREAKER_BACKOFF_MIN
+        else:
+            self._breaker_backoff = min(self._breaker_backoff * 2, BREAKER_BACKOFF_MAX)
+        _LOGGER.debug(
+            "%s unreachable, probing again in %s",
+            self.transport.host,
+            self._breaker_backoff,
+        )
+        self.update_interval = self._breaker_backoff
+
+    def _due_registers(self, power_status: PowerStatus) -> list[str]:
+        """Return the statuses to read in this cycle."""
+        in_use = {register for context in self.async_contexts() for register in context}
+        now = time.monotonic()
+
+        due = []
+        for register, interval in REGISTER_REFRESH_INTERVALS.items():
+            if (
+                self.supported_registers is not None
+                and register not in self.supported_registers
+            ):
+                continue
+            if (
+                register not in self._last_read
+                or self._needs_probe(register, power_status)
+                or (
+                    # Nothing else changes while off
+                    power_status == PowerStatus.On
+                    and register in in_use
+                    and (
+                        register in self._stale
+                        or now - self._last_read[register] >= interval.total_seconds()
+                    )
+                )
+            ):
+                due.append(register)
+        return due
+
+    def _record_probe(self, register: str, answered: bool) -> None:
+        """Record whether the model answered a status it was probed for.
+
+        One answer shows the status is supported. A rejection may only last a
+        moment, so it takes several in polls spread apart to rule it out.
+        """
+        if answered:
+            self._probed[register] = True
+            self._rejections.pop(register, None)
+            return
+
+        now = time.monotonic()
+        rejections, last = self._rejections.get(register, (0, 0.0))
+        if rejections and now - last < PROBE_REJECTION_SPACING.total_seconds():
+            return
+        if rejections + 1 >= PROBE_REJECTIONS:
+            self._probed[register] = False
+        self._rejections[register] = (rejections + 1, now)
+
+    def _needs_probe(self, register: str, power_status: PowerStatus) -> bool:
+        """Return if a status still has to be tried while the projector is on."""
+        return (
+            self.supported_registers is None
+            and power_status == PowerStatus.On
+            and register not in self._probed
+        )
+
+    def _next_interval(self, power_status: PowerStatus) -> timedelta:
+        """Return the poll interval matching the power state."""
+        if time.monotonic() < self._boost_until:
+            return POLL_INTERVAL_BOOST
+        if power_status == PowerStatus.Off:
+            return POLL_INTERVAL_OFF
+        return POLL_INTERVAL_ON
+
+
+# Replies telling whether a model supports a status, anything else is retried
+_PROBE_REPLIES = (ReplyType.DATA, ReplyType.ERROR, ReplyType.NACK)
+
+
+def _changed_fields(
+    previous: HitachiProjectorData | None, current: HitachiProjectorData | None
+) -> dict[str, Any]:
+    """Return the statuses that differ between two snapshots, with their new value."""
+    if current is None:
+        return {}
+    return {
+        field.name: getattr(current, field.name)
+        for field in fields(current)
+        if previous is None
+        or getattr(previous, field.name) != getattr(current, field.name)
+    }
+
+
+def _data_or_none(reply: tuple) -> object | None:
+    """Return the parsed value of a status reply, or None if it carried no data."""
+    reply_type, value = reply
+    if reply_type != ReplyType.DATA:
+        return None
+    return value
@@ -0,0 +1,44 @@
+"""Diagnostics support for the Hitachi Projector integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from . import DATA_FLEET, HitachiProjectorConfigEntry
+
+TO_REDACT = {CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: HitachiProjectorConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    provider = entry.runtime_data
+    coordinator = provider.coordinator
+    fleet = hass.data.get(DATA_FLEET)
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "device_info": dict(provider.device_info),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "data": asdict(coordinator.data) if coordinator.data else None,
+        },
+        "connection": {
+            "connected": provider.transport.connected,
+            "stats": provider.transport.stats.as_dict(),
+        },
+        "usage": provider.usage_history.as_dict(),
+        "fleet": {
+            "size": fleet.size,
+            "last_cycle": asdict(fleet.last_cycle) if fleet.last_cycle else None,
+        }
+        if fleet is not None
+        else None,
+    }
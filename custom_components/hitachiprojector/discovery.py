@@ -0,0 +1,87 @@
+"""Network scan for Hitachi projectors."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from ipaddress import IPv4Network
+import logging
+
+from libhitachiprojector.hitachiprojector import PORT
+
+from .const import DISCOVERY_CONCURRENCY, DISCOVERY_TIMEOUT
+from .pjlink import PJLINK_PORT, PJLinkClient, PJLinkError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DiscoveredProjector:
+    """Projector answering on the Hitachi control port."""
+
+    host: str
+    name: str | None = None
+    model: str | None = None
+
+    @property
+    def label(self) -> str:
+        """Return a label to pick the projector by."""
+        if self.name:
+            return f"{self.name} ({self.model or 'unknown model'}, {self.host})"
+        return self.host
+
+
+async def async_discover_projectors(
+    network: IPv4Network, password: str | None = None
+) -> list[DiscoveredProjector]:
+    """Scan a network for projectors and identify them over PJLink.
+
+    Every host is probed at the same time, bounded by the discovery
+    concurrency, with a short timeout each.
+    """
+    semaphore = asyncio.Semaphore(DISCOVERY_CONCURRENCY)
+
+    async def _async_probe(host: str) -> DiscoveredProjector | None:
+        async with semaphore:
+            if not await _async_port_open(host, PORT):
+                return None
+            return await _async_identify(host, password)
+
+    results = await asyncio.gather(
+        *(_async_probe(str(host)) for host in network.hosts())
+    )
+    projectors = [projector for projector in results if projector is not None]
+    _LOGGER.debug("Found %s projectors in %s", len(projectors), network)
+    return projectors
+
+
+async def _async_port_open(host: str, port: int) -> bool:
+    """Return if a host accepts connections on a port."""
+    try:
+        async with asyncio.timeout(DISCOVERY_TIMEOUT):
+            _, writer = await asyncio.open_connection(host, port)
+    except (TimeoutError, OSError):
+        return False
+
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+async def _async_identify(host: str, password: str | None) -> DiscoveredProjector:
+    """Query the name and model of a projector, if it answers PJLink."""
+    try:
+        async with PJLinkClient(
+            host, password, PJLINK_PORT, DISCOVERY_TIMEOUT
+        ) as client:
+            return DiscoveredProjector(
+                host,
+                name=await client.async_get_name(),
+                model=await client.async_get_product_name(),
+            )
+    except PJLinkError as err:
+        _LOGGER.debug("Unable to identify %s: %s", host, err)
+        return DiscoveredProjector(host)
@@ -0,0 +1,117 @@
+"""Fleet wide poll scheduling for the Hitachi Projector integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+import math
+import time
+
+from homeassistant.core import callback
+
+from .const import FLEET_CYCLE, FLEET_MAX_CONCURRENT_POLLS, FLEET_STARTUP_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fractional part of the golden ratio, spreads any number of phases evenly
+_PHASE_STEP = (math.sqrt(5) - 1) / 2
+
+
+@dataclass(frozen=True)
+class FleetCycleStats:
+    """Poll latency across the fleet over one cycle."""
+
+    polls: int
+    mean_latency: float
+    max_latency: float
+
+
+class HitachiProjectorFleet:
+    """Scheduler shared by every configured projector.
+
+    Caps how many projectors are polled at the same time, gives every
+    projector its own phase within the poll interval so that polls do not
+    all start together, and keeps track of poll latency across the fleet.
+    """
+
+    def __init__(self, max_concurrent_polls: int = FLEET_MAX_CONCURRENT_POLLS) -> None:
+        """Initialize the fleet."""
+        self._semaphore = asyncio.Semaphore(max_concurrent_polls)
+        self._phases: dict[str, float] = {}
+        self._phase_index = 0
+
+        self._cycle_start = time.monotonic()
+        self._cycle_latencies: list[float] = []
+        self.last_cycle: FleetCycleStats | None = None
+
+    @property
+    def size(self) -> int:
+        """Return the number of projectors in the fleet."""
+        return len(self._phases)
+
+    @callback
+    def async_register(self, entry_id: str) -> None:
+        """Add a projector and assign it a poll phase."""
+        self._phases[entry_id] = (self._phase_index * _PHASE_STEP) % 1
+        self._phase_index += 1
+
+    @callback
+    def async_unregister(self, entry_id: str) -> None:
+        """Remove a projector."""
+        self._phases.pop(entry_id, None)
+
+    def startup_delay(self, entry_id: str) -> float:
+        """Return how many seconds the first poll of a projector waits after a start."""
+        return self._phases.get(entry_id, 0.0) * FLEET_STARTUP_WINDOW.total_seconds()
+
+    def align_interval(self, entry_id: str, interval: timedelta) -> timedelta:
+        """Stretch or shrink an interval so the next poll lands on the entry's phase.
+
+        The result is between half and one and a half times the interval.
+        """
+        seconds = interval.total_seconds()
+        if not seconds:
+            return interval
+
+        phase = self._phases.get(entry_id, 0.0) * seconds
+        now = time.monotonic()
+        due = math.ceil((now + seconds / 2 - phase) / seconds) * seconds + phase
+        return timedelta(seconds=due - now)
+
+    @asynccontextmanager
+    async def async_poll_slot(self) -> AsyncIterator[None]:
+        """Wait for a free poll slot and time the poll that runs in it."""
+        async with self._semaphore:
+            start = time.monotonic()
+            try:
+                yield
+            finally:
+                self._record(time.monotonic() - start)
+
+    def _record(self, latency: float) -> None:
+        """Record a poll latency and close the cycle once it has run its course."""
+        self._cycle_latencies.append(latency)
+
+        now = time.monotonic()
+        if now - self._cycle_start < FLEET_CYCLE.total_seconds():
+            return
+
+        latencies = self._cycle_latencies
+        self.last_cycle = FleetCycleStats(
+            polls=len(latencies),
+            mean_latency=sum(latencies) / len(latencies),
+            max_latency=max(latencies),
+        )
+        _LOGGER.debug(
+            "Fleet of %s polled %s times, mean latency %.3fs, max %.3fs",
+            self.size,
+            self.last_cycle.polls,
+            self.last_cycle.mean_latency,
+            self.last_cycle.max_latency,
+        )
+        self._cycle_start = now
+        self._cycle_latencies = []
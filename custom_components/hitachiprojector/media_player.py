@@ -2,12 +2,9 @@
 
 from __future__ import annotations
 
-from libhitachiprojector.hitachiprojector import (
-    Command,
-    InputSource,
-    ReplyType,
-    commands,
-)
+from typing import Any
+
+from libhitachiprojector.hitachiprojector import InputSource, PowerStatus
 
 from homeassistant.components.media_player import (
     MediaPlayerDeviceClass,
@@ -16,13 +13,15 @@ from homeassistant.components.media_player import (
     MediaPlayerState,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import InvalidStateError
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import HitachiProvider
-from .const import DOMAIN, POWER_STATUS_TO_MEDIA_PLAYER_STATE, SOURCE_TO_SET_COMMAND
+from .const import DOMAIN, POWER_STATUS_TO_MEDIA_PLAYER_STATE
+from .coordinator import HitachiProjectorCoordinator
+from .registers import REGISTERS, MuteStatus
 
 
 async def async_setup_entry(
@@ -37,19 +36,19 @@ async def async_setup_entry(
     async_add_entities([HitachiProjectorMediaPlayer(provider, config_entry.entry_id)])
 
 
-class HitachiProjectorMediaPlayer(MediaPlayerEntity):
+class HitachiProjectorMediaPlayer(
+    CoordinatorEntity[HitachiProjectorCoordinator], MediaPlayerEntity
+):
     """Representation of a media player."""
 
     entry_id: str
 
-    supported_features = (
-        MediaPlayerEntityFeature.TURN_ON
-        | MediaPlayerEntityFeature.TURN_OFF
-        | MediaPlayerEntityFeature.SELECT_SOURCE
-    )
-
     def __init__(self, provider: HitachiProvider, entry_id: str) -> None:
         """Initialize the media player."""
+        super().__init__(
+            provider.coordinator,
+            context=("power_status", "input_source", "mute_status"),
+        )
         self.entry_id = entry_id
         self.provider = provider
 
@@ -60,25 +59,34 @@ class HitachiProjectorMediaPlayer(MediaPlayerEntity):
 
         self._attr_device_class = MediaPlayerDeviceClass.TV
 
-        self._attr_source_list = [e.name for e in InputSource]
+        self._attr_source_list = provider.sources
 
-    async def async_added_to_hass(self) -> None:
-        """Run when this Entity has been added to HA."""
+        self._attr_supported_features = (
+            MediaPlayerEntityFeature.TURN_ON
+            | MediaPlayerEntityFeature.TURN_OFF
+            | MediaPlayerEntityFeature.SELECT_SOURCE
+        )
+        if provider.supports("mute_status"):
+            self._attr_supported_features |= MediaPlayerEntityFeature.VOLUME_MUTE
 
-    async def async_will_remove_from_hass(self) -> None:
-        """Entity being removed from hass."""
+        self._async_update_attrs()
 
     @property
     def device_info(self) -> DeviceInfo:
         """Information about this entity/device."""
         return {
-            "configuration_url": f"http://{self.provider.hitachi_connection.host}",
+            "configuration_url": f"http://{self.provider.transport.host}",
             "identifiers": {(DOMAIN, self.entry_id)},
             "manufacturer": self.provider.device_info.get("manufacturer", "Hitachi"),
             "model": self.provider.device_info.get("model"),
             "name": self.provider.device_info.get("name", "Hitachi Projector"),
         }
 
+    @property
+    def available(self) -> bool:
+        """Return if the projector was polled since it was set up."""
+        return super().available and self.coordinator.data is not None
+
     @property
     def icon(self) -> str | None:
         """Return the icon to use in the frontend, if any."""
@@ -87,45 +95,42 @@ class HitachiProjectorMediaPlayer(MediaPlayerEntity):
 
         return "mdi:projector-off"
 
-    async def async_update(self) -> None:
-        """Retrieve latest state of the device."""
-        try:
-            (
-                reply_type,
-                status,
-            ) = await self.provider.hitachi_connection.get_power_status()
-            if reply_type != ReplyType.DATA or status is None:
-                raise InvalidStateError("Unexpected reply type")
-            self._attr_state = POWER_STATUS_TO_MEDIA_PLAYER_STATE[status]
-            self._attr_available = True
-        except RuntimeError:
-            self._attr_available = False
-
-        reply_type, status = await self.provider.hitachi_connection.get_input_source()
-        if reply_type == ReplyType.DATA and status is not None:
-            self._attr_source = status.name
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._async_update_attrs()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the latest snapshot."""
+        if (data := self.coordinator.data) is None:
+            return
+        self._attr_state = POWER_STATUS_TO_MEDIA_PLAYER_STATE[data.power_status]
+        if data.input_source is not None:
+            self._attr_source = data.input_source.name
+        self._attr_is_volume_muted = (
+            None if data.mute_status is None else data.mute_status == MuteStatus.On
+        )
 
     async def async_turn_on(self) -> None:
         """Turn the device on."""
-        reply_type, _ = await self.provider.hitachi_connection.async_send_cmd(
-            commands[Command.PowerTurnOn]
-        )
-        if reply_type != ReplyType.ACK:
-            raise InvalidStateError("Unexpected reply type")
+        await self._async_set("power_status", PowerStatus.On)
 
     async def async_turn_off(self) -> None:
         """Turn the device off."""
-        reply_type, _ = await self.provider.hitachi_connection.async_send_cmd(
-            commands[Command.PowerTurnOff]
-        )
-        if reply_type != ReplyType.ACK:
-            raise InvalidStateError("Unexpected reply type")
+        await self._async_set("power_status", PowerStatus.Off)
 
     async def async_select_source(self, source: str) -> None:
         """Select input source."""
-        command = SOURCE_TO_SET_COMMAND[source]
-        reply_type, _ = await self.provider.hitachi_connection.async_send_cmd(
-            commands[command]
+        await self._async_set("input_source", InputSource[source])
+
+    async def async_mute_volume(self, mute: bool) -> None:
+        """Mute or unmute the audio."""
+        await self._async_set("mute_status", MuteStatus.On if mute else MuteStatus.Off)
+
+    async def _async_set(self, register: str, value: Any) -> None:
+        """Send the command setting a status to a value."""
+        await self.provider.command_queue.async_send(
+            register, value, REGISTERS[register].set_commands[value]
         )
-        if reply_type != ReplyType.ACK:
-            raise InvalidStateError("Unexpected reply type")
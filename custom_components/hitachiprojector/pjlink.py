@@ -0,0 +1,167 @@
+"""Minimal asyncio PJLink class 1 client."""
+
+from __future__ import annotations
+
+import asyncio
+from hashlib import md5
+import logging
+from types import TracebackType
+from typing import Self
+
+_LOGGER = logging.getLogger(__name__)
+
+PJLINK_PORT = 4352
+PJLINK_GREETING = "PJLINK "
+PJLINK_AUTH_ERROR = "PJLINK ERRA"
+PJLINK_TERMINATOR = b"\r"
+
+PJLINK_ERRORS = {
+    "ERR1": "undefined command",
+    "ERR2": "out of parameter",
+    "ERR3": "unavailable time",
+    "ERR4": "projector failure",
+}
+
+
+class PJLinkError(Exception):
+    """Error talking to a PJLink projector."""
+
+
+class PJLinkAuthError(PJLinkError):
+    """PJLink password was rejected."""
+
+
+class PJLinkClient:
+    """Asyncio PJLink class 1 client for a single connection.
+
+    Use as an async context manager to run several queries over one connection.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        password: str | None = None,
+        port: int = PJLINK_PORT,
+        timeout: float = 2.0,
+    ) -> None:
+        """Initialize the client."""
+        self.host = host
+        self.password = password
+        self.port = port
+        self.timeout = timeout
+
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._digest = ""
+
+    async def __aenter__(self) -> Self:
+        """Connect and authenticate."""
+        await self.async_connect()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the connection."""
+        await self.async_close()
+
+    async def async_connect(self) -> None:
+        """Open the connection and read the authentication greeting."""
+        try:
+            async with asyncio.timeout(self.timeout):
+                self._reader, self._writer = await asyncio.open_connection(
+                    self.host, self.port
+                )
+                greeting = await self._async_read_line()
+        except (TimeoutError, OSError) as err:
+            await self.async_close()
+            raise PJLinkError(f"Unable to connect to {self.host}") from err
+
+        if not greeting.startswith(PJLINK_GREETING):
+            await self.async_close()
+            raise PJLinkError(f"Unexpected greeting: {greeting}")
+
+        security = greeting[len(PJLINK_GREETING) :]
+        if security == "0":
+            self._digest = ""
+        elif security.startswith("1 "):
+            if not self.password:
+                await self.async_close()
+                raise PJLinkAuthError("Projector requires a password")
+            salt = security[2:]
+            self._digest = md5((salt + self.password).encode()).hexdigest()
+        else:
+            await self.async_close()
+            raise PJLinkError(f"Unexpected greeting: {greeting}")
+
+    async def async_close(self) -> None:
+        """Close the connection."""
+        writer = self._writer
+        self._reader = self._writer = None
+        if writer is None:
+            return
+
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+    async def async_get(self, body: str) -> str:
+        """Query a PJLink class 1 command and return its parameter."""
+        if self._writer is None:
+            raise PJLinkError("Not connected")
+
+        # The digest only prefixes the first command of a connection
+        request = f"{self._digest}%1{body} ?\r"
+        self._digest = ""
+
+        try:
+            async with asyncio.timeout(self.timeout):
+                self._writer.write(request.encode())
+                await self._writer.drain()
+                response = await self._async_read_line()
+        except (TimeoutError, OSError) as err:
+            await self.async_close()
+            raise PJLinkError(f"No response to {body} from {self.host}") from err
+
+        if response == PJLINK_AUTH_ERROR:
+            await self.async_close()
+            raise PJLinkAuthError("Authentication rejected")
+
+        prefix = f"%1{body}="
+        if not response.upper().startswith(prefix):
+            raise PJLinkError(f"Unexpected response to {body}: {response}")
+
+        param = response[len(prefix) :]
+        if param in PJLINK_ERRORS:
+            raise PJLinkError(f"{body} failed: {PJLINK_ERRORS[param]}")
+
+        return param
+
+    async def async_get_name(self) -> str:
+        """Get the projector name."""
+        return await self.async_get("NAME")
+
+    async def async_get_manufacturer(self) -> str:
+        """Get the manufacturer name."""
+        return await self.async_get("INF1")
+
+    async def async_get_product_name(self) -> str:
+        """Get the product name."""
+        return await self.async_get("INF2")
+
+    async def async_get_inputs(self) -> list[str]:
+        """Get the input numbers the projector has."""
+        return (await self.async_get("INST")).split()
+
+    async def _async_read_line(self) -> str:
+        assert self._reader is not None
+        try:
+            line = await self._reader.readuntil(PJLINK_TERMINATOR)
+        except asyncio.IncompleteReadError as err:
+            raise ConnectionResetError(f"Connection closed by {self.host}") from err
+        return line[:-1].decode("utf-8", errors="replace")
@@ -0,0 +1,214 @@
+"""Opt-in profiling of the Hitachi Projector integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Awaitable, Callable, Coroutine, Generator
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+import io
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_PROFILE_THRESHOLD, PROFILE_HISTORY, PROFILE_TOP_FUNCTIONS
+
+if TYPE_CHECKING:
+    import cProfile
+
+_LOGGER = logging.getLogger(__name__)
+
+# Set while a profiled call runs, calls made from it are timed but not
+# profiled again, as only one profiler can be active at a time
+_PROFILING: ContextVar[bool] = ContextVar(f"{__name__}.profiling", default=False)
+
+
+@dataclass
+class CallProfile:
+    """Wall and event loop time of one kind of call."""
+
+    calls: int = 0
+    wall_time: float = 0.0
+    loop_time: float = 0.0
+    max_loop_time: float = 0.0
+
+
+@dataclass(frozen=True)
+class SlowCall:
+    """Call that held the event loop for longer than the threshold."""
+
+    name: str
+    started: str
+    wall_time: float
+    loop_time: float
+    profile: str | None
+
+
+class HitachiProjectorProfiler:
+    """Measure how long calls run and how long they hold the event loop.
+
+    Loop time is the time spent inside the call's own steps, between two
+    awaits. Calls holding the loop for longer than the threshold are kept
+    with their cProfile statistics. Disabled, wrapping a call is a no-op.
+    """
+
+    def __init__(
+        self, enabled: bool = False, threshold: float = DEFAULT_PROFILE_THRESHOLD
+    ) -> None:
+        """Initialize the profiler."""
+        self.enabled = enabled
+        self.threshold = threshold
+        self.calls: dict[str, CallProfile] = {}
+        self.slow_calls: deque[SlowCall] = deque(maxlen=PROFILE_HISTORY)
+
+    def configure(self, enabled: bool, threshold: float) -> None:
+        """Switch profiling on or off and set the slow call threshold."""
+        if enabled != self.enabled:
+            _LOGGER.debug("Profiling %s", "enabled" if enabled else "disabled")
+        self.enabled = enabled
+        self.threshold = threshold
+
+    def clear(self) -> None:
+        """Forget everything recorded so far."""
+        self.calls.clear()
+        self.slow_calls.clear()
+
+    def wrap[T](self, name: str, coro: Coroutine[Any, Any, T]) -> Awaitable[T]:
+        """Return an awaitable running a coroutine, profiled if enabled."""
+        if not self.enabled:
+            return coro
+        return _ProfiledCall(self, name, coro)
+
+    def run_callback[T](self, name: str, func: Callable[[], T]) -> T:
+        """Run a callback, profiled if enabled."""
+        if not self.enabled:
+            return func()
+
+        profile = _enable_profile(_new_profile())
+        start = time.perf_counter()
+        try:
+            return func()
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+            self.record(name, elapsed, elapsed, profile)
+
+    def record(
+        self,
+        name: str,
+        wall_time: float,
+        loop_time: float,
+        profile: cProfile.Profile | None = None,
+    ) -> None:
+        """Record a finished call, keeping its profile if it was slow."""
+        if (call := self.calls.get(name)) is None:
+            call = self.calls[name] = CallProfile()
+        call.calls += 1
+        call.wall_time += wall_time
+        call.loop_time += loop_time
+        call.max_loop_time = max(call.max_loop_time, loop_time)
+
+        if loop_time < self.threshold:
+            return
+
+        _LOGGER.debug(
+            "%s held the event loop for %.3fs of %.3fs", name, loop_time, wall_time
+        )
+        self.slow_calls.append(
+            SlowCall(
+                name=name,
+                started=(dt_util.utcnow() - timedelta(seconds=wall_time)).isoformat(),
+                wall_time=wall_time,
+                loop_time=loop_time,
+                profile=_format_profile(profile) if profile is not None else None,
+            )
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return everything recorded for the dump service."""
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "calls": {name: asdict(call) for name, call in self.calls.items()},
+            "slow_calls": [asdict(call) for call in self.slow_calls],
+        }
+
+
+class _ProfiledCall[T]:
+    """Awaitable driving a coroutine and timing each step it takes."""
+
+    def __init__(
+        self,
+        profiler: HitachiProjectorProfiler,
+        name: str,
+        coro: Coroutine[Any, Any, T],
+    ) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._coro = coro
+
+    def __await__(self) -> Generator[Any, Any, T]:
+        profile = None if _PROFILING.get() else _new_profile()
+        token = _PROFILING.set(True)
+
+        loop_time = 0.0
+        start = time.perf_counter()
+        value: Any = None
+        error: BaseException | None = None
+        try:
+            while True:
+                step = time.perf_counter()
+                profile = _enable_profile(profile)
+                try:
+                    if error is None:
+                        future = self._coro.send(value)
+                    else:
+                        future = self._coro.throw(error)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    if profile is not None:
+                        profile.disable()
+                    loop_time += time.perf_counter() - step
+
+                try:
+                    value, error = (yield future), None
+                except BaseException as err:  # noqa: BLE001
+                    value, error = None, err
+        finally:
+            _PROFILING.reset(token)
+            self._profiler.record(
+                self._name, time.perf_counter() - start, loop_time, profile
+            )
+
+
+def _new_profile() -> cProfile.Profile:
+    """Create a profiler, cProfile is only imported once debug profiling is on."""
+    import cProfile
+
+    return cProfile.Profile()
+
+
+def _enable_profile(profile: cProfile.Profile | None) -> cProfile.Profile | None:
+    """Enable a profiler, or return None if another one is already active."""
+    if profile is None:
+        return None
+    try:
+        profile.enable()
+    except ValueError:
+        return None
+    return profile
+
+
+def _format_profile(profile: cProfile.Profile) -> str:
+    """Format the functions that took the most cumulative time."""
+    import pstats
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profile, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP_FUNCTIONS)
+    return stream.getvalue()
@@ -0,0 +1,276 @@
+"""Status registers of Hitachi projectors."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from enum import Enum, StrEnum
+import struct
+from typing import Any
+
+from libhitachiprojector.hitachiprojector import (
+    AutoEcoModeStatus,
+    BlankStatus,
+    Command,
+    EcoModeStatus,
+    ErrorStatus,
+    InputSource,
+    PowerStatus,
+    commands,
+)
+
+from .const import SOURCE_TO_SET_COMMAND
+
+FRAME_HEADER = bytes.fromhex("beef030600")
+ACTION_SET = bytes.fromhex("0100")
+ACTION_GET = bytes.fromhex("0200")
+
+# CRC-16 of the action, type and setting, with the reflected 0x8005
+# polynomial and the initial value every frame of the protocol library uses
+_CRC_INIT = 0x1C17
+
+
+class ExtendedCommand(StrEnum):
+    """Commands the protocol library does not define."""
+
+    MuteGet = "mute_get"
+    MuteOn = "mute_on"
+    MuteOff = "mute_off"
+    FreezeGet = "freeze_get"
+    FreezeOn = "freeze_on"
+    FreezeOff = "freeze_off"
+    VolumeGet = "volume_get"
+    PictureModeGet = "picture_mode_get"
+    PictureModeNormal = "picture_mode_normal"
+    PictureModeCinema = "picture_mode_cinema"
+    PictureModeDynamic = "picture_mode_dynamic"
+    PictureModeCustom = "picture_mode_custom"
+    PictureModeBoardBlack = "picture_mode_board_black"
+    PictureModeBoardGreen = "picture_mode_board_green"
+    PictureModeWhiteboard = "picture_mode_whiteboard"
+    PictureModeDaytime = "picture_mode_daytime"
+
+
+class MuteStatus(Enum):
+    """Audio mute status."""
+
+    Off = 0x0000
+    On = 0x0100
+
+
+class FreezeStatus(Enum):
+    """Picture freeze status."""
+
+    Normal = 0x0000
+    Freeze = 0x0100
+
+
+class PictureMode(Enum):
+    """Picture mode."""
+
+    Normal = 0x0000
+    Cinema = 0x0100
+    Dynamic = 0x0400
+    Custom = 0x1000
+    BoardBlack = 0x2000
+    BoardGreen = 0x2100
+    Whiteboard = 0x2200
+    Daytime = 0x2300
+
+
+def _crc(data: bytes) -> int:
+    """Return the frame checksum of a command."""
+    crc = _CRC_INIT
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def _frame(action: bytes, register_type: str, setting: int = 0) -> bytes:
+    """Build the frame of a command, types and settings as listed in the manual."""
+    body = action + bytes.fromhex(register_type) + setting.to_bytes(2, "big")
+    return FRAME_HEADER + _crc(body).to_bytes(2, "big") + body
+
+
+_MUTE = "0220"
+_FREEZE = "0230"
+_VOLUME = "0120"
+_PICTURE_MODE = "ba30"
+
+_PICTURE_MODE_COMMANDS = {
+    PictureMode.Normal: ExtendedCommand.PictureModeNormal,
+    PictureMode.Cinema: ExtendedCommand.PictureModeCinema,
+    PictureMode.Dynamic: ExtendedCommand.PictureModeDynamic,
+    PictureMode.Custom: ExtendedCommand.PictureModeCustom,
+    PictureMode.BoardBlack: ExtendedCommand.PictureModeBoardBlack,
+    PictureMode.BoardGreen: ExtendedCommand.PictureModeBoardGreen,
+    PictureMode.Whiteboard: ExtendedCommand.PictureModeWhiteboard,
+    PictureMode.Daytime: ExtendedCommand.PictureModeDaytime,
+}
+
+# Frame of every command, the library's and the extended ones
+FRAMES: dict[Command | ExtendedCommand, bytes] = {
+    **commands,
+    ExtendedCommand.MuteGet: _frame(ACTION_GET, _MUTE),
+    ExtendedCommand.MuteOn: _frame(ACTION_SET, _MUTE, MuteStatus.On.value),
+    ExtendedCommand.MuteOff: _frame(ACTION_SET, _MUTE, MuteStatus.Off.value),
+    ExtendedCommand.FreezeGet: _frame(ACTION_GET, _FREEZE),
+    ExtendedCommand.FreezeOn: _frame(ACTION_SET, _FREEZE, FreezeStatus.Freeze.value),
+    ExtendedCommand.FreezeOff: _frame(ACTION_SET, _FREEZE, FreezeStatus.Normal.value),
+    ExtendedCommand.VolumeGet: _frame(ACTION_GET, _VOLUME),
+    ExtendedCommand.PictureModeGet: _frame(ACTION_GET, _PICTURE_MODE),
+    **{
+        command: _frame(ACTION_SET, _PICTURE_MODE, mode.value)
+        for mode, command in _PICTURE_MODE_COMMANDS.items()
+    },
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class HitachiProjectorRegister:
+    """Status register, with how to read it and how to set it.
+
+    The key is the name of the status in the coordinator data. Switchable
+    registers have an on and off value, each with a set command.
+    """
+
+    key: str
+    get_command: Command | ExtendedCommand
+    parse: Callable[[memoryview], Any]
+    set_commands: Mapping[Any, Command | ExtendedCommand] = field(default_factory=dict)
+    on_value: Any = None
+    off_value: Any = None
+
+
+_STATUS = struct.Struct(">H")
+_NUMBER = struct.Struct("<H")
+
+
+def _status_parser[E: Enum](enum: type[E]) -> Callable[[memoryview], E]:
+    """Return a parser of a big endian status, with its members looked up once."""
+    members = {member.value: member for member in enum}
+    unpack = _STATUS.unpack_from
+
+    def parse(data: memoryview) -> E:
+        (value,) = unpack(data)
+        try:
+            return members[value]
+        except KeyError:
+            raise ValueError(f"Unknown {enum.__name__} {value:04x}") from None
+
+    return parse
+
+
+def _parse_number(data: memoryview) -> int:
+    """Parse a little endian number, such as an hour counter or a level."""
+    return _NUMBER.unpack_from(data)[0]
+
+
+REGISTERS: dict[str, HitachiProjectorRegister] = {
+    register.key: register
+    for register in (
+        HitachiProjectorRegister(
+            key="power_status",
+            get_command=Command.PowerGet,
+            parse=_status_parser(PowerStatus),
+            set_commands={
+                PowerStatus.On: Command.PowerTurnOn,
+                PowerStatus.Off: Command.PowerTurnOff,
+            },
+            on_value=PowerStatus.On,
+            off_value=PowerStatus.Off,
+        ),
+        HitachiProjectorRegister(
+            key="input_source",
+            get_command=Command.InputSourceGet,
+            parse=_status_parser(InputSource),
+            set_commands={
+                InputSource[source]: command
+                for source, command in SOURCE_TO_SET_COMMAND.items()
+            },
+        ),
+        HitachiProjectorRegister(
+            key="error_status",
+            get_command=Command.ErrorStatusGet,
+            parse=_status_parser(ErrorStatus),
+        ),
+        HitachiProjectorRegister(
+            key="filter_time",
+            get_command=Command.FilterTimeGet,
+            parse=_parse_number,
+        ),
+        HitachiProjectorRegister(
+            key="lamp_time",
+            get_command=Command.LampTimeGet,
+            parse=_parse_number,
+        ),
+        HitachiProjectorRegister(
+            key="blank_status",
+            get_command=Command.BlankGet,
+            parse=_status_parser(BlankStatus),
+            set_commands={
+                BlankStatus.On: Command.BlankOn,
+                BlankStatus.Off: Command.BlankOff,
+            },
+            on_value=BlankStatus.On,
+            off_value=BlankStatus.Off,
+        ),
+        HitachiProjectorRegister(
+            key="eco_mode_status",
+            get_command=Command.EcoModeGet,
+            parse=_status_parser(EcoModeStatus),
+            set_commands={
+                EcoModeStatus.Eco: Command.EcoModeEco,
+                EcoModeStatus.Normal: Command.EcoModeNormal,
+            },
+            on_value=EcoModeStatus.Eco,
+            off_value=EcoModeStatus.Normal,
+        ),
+        HitachiProjectorRegister(
+            key="auto_eco_mode_status",
+            get_command=Command.AutoEcoModeGet,
+            parse=_status_parser(AutoEcoModeStatus),
+            set_commands={
+                AutoEcoModeStatus.On: Command.AutoEcoModeOn,
+                AutoEcoModeStatus.Off: Command.AutoEcoModeOff,
+            },
+            on_value=AutoEcoModeStatus.On,
+            off_value=AutoEcoModeStatus.Off,
+        ),
+        HitachiProjectorRegister(
+            key="mute_status",
+            get_command=ExtendedCommand.MuteGet,
+            parse=_status_parser(MuteStatus),
+            set_commands={
+                MuteStatus.On: ExtendedCommand.MuteOn,
+                MuteStatus.Off: ExtendedCommand.MuteOff,
+            },
+            on_value=MuteStatus.On,
+            off_value=MuteStatus.Off,
+        ),
+        HitachiProjectorRegister(
+            key="freeze_status",
+            get_command=ExtendedCommand.FreezeGet,
+            parse=_status_parser(FreezeStatus),
+            set_commands={
+                FreezeStatus.Freeze: ExtendedCommand.FreezeOn,
+                FreezeStatus.Normal: ExtendedCommand.FreezeOff,
+            },
+            on_value=FreezeStatus.Freeze,
+            off_value=FreezeStatus.Normal,
+        ),
+        HitachiProjectorRegister(
+            key="volume",
+            get_command=ExtendedCommand.VolumeGet,
+            parse=_parse_number,
+        ),
+        HitachiProjectorRegister(
+            key="picture_mode",
+            get_command=ExtendedCommand.PictureModeGet,
+            parse=_status_parser(PictureMode),
+            set_commands=_PICTURE_MODE_COMMANDS,
+        ),
+    )
+}
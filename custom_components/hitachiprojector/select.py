@@ -0,0 +1,123 @@
+"""Platform for select integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from operator import attrgetter
+
+from homeassistant.components.select import SelectEntity, SelectEntityDescription
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from . import HitachiProvider, async_add_supported_entities
+from .const import DOMAIN
+from .coordinator import HitachiProjectorCoordinator
+from .registers import REGISTERS
+
+
+@dataclass(frozen=True, kw_only=True)
+class HitachiProjectorSelectEntityDescription(SelectEntityDescription):
+    """Select picking the value of a status register."""
+
+    register: str
+
+
+SELECTS: tuple[HitachiProjectorSelectEntityDescription, ...] = (
+    HitachiProjectorSelectEntityDescription(
+        key="picture_mode", translation_key="picture_mode", register="picture_mode"
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add selects for passed config_entry in HA."""
+
+    provider = config_entry.runtime_data
+
+    async_add_supported_entities(
+        async_add_entities,
+        config_entry,
+        [
+            HitachiProjectorSelect(provider, config_entry.entry_id, description)
+            for description in SELECTS
+        ],
+    )
+
+
+def _option(value: Enum) -> str:
+    """Return the option of a status value."""
+    return value.name.lower()
+
+
+class HitachiProjectorSelect(
+    CoordinatorEntity[HitachiProjectorCoordinator], SelectEntity
+):
+    """Select of a status register."""
+
+    entity_description: HitachiProjectorSelectEntityDescription
+    entry_id: str
+    register: str
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        provider: HitachiProvider,
+        entry_id: str,
+        description: HitachiProjectorSelectEntityDescription,
+    ) -> None:
+        """Initialize the select."""
+        super().__init__(provider.coordinator, context=(description.register,))
+        self.entity_description = description
+        self.provider = provider
+        self.entry_id = entry_id
+        self.register = description.register
+
+        self._values = {
+            _option(value): (value, command)
+            for value, command in REGISTERS[description.register].set_commands.items()
+        }
+        self._get_value = attrgetter(description.register)
+
+        self._attr_unique_id = f"hitachiprojector_{entry_id}_{description.key}"
+        self._attr_options = list(self._values)
+
+        self._async_update_attrs()
+
+    @property
+    def available(self) -> bool:
+        """Return if the projector answered the status query for this select."""
+        return super().available and self._attr_current_option is not None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._async_update_attrs()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the latest snapshot."""
+        data = self.coordinator.data
+        value = None if data is None else self._get_value(data)
+        self._attr_current_option = None if value is None else _option(value)
+
+    async def async_select_option(self, option: str) -> None:
+        """Set the status to the selected value."""
+        value, command = self._values[option]
+        await self.provider.command_queue.async_send(self.register, value, command)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Information about this entity/device."""
+        return {
+            "identifiers": {(DOMAIN, self.entry_id)},
+        }
@@ -1,23 +1,183 @@
-"""Platform for media player integration."""
+"""Platform for sensor integration."""
 
 from __future__ import annotations
 
-from libhitachiprojector.hitachiprojector import ReplyType
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTime
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import HomeAssistantError, InvalidStateError
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import HitachiProvider
-from .const import DOMAIN, ERROR_STATUS_OPTIONS, ERROR_STATUS_TO_OPTION
+from . import HitachiProvider, async_add_supported_entities
+from .const import (
+    CONF_FILTER_LIFE,
+    CONF_LAMP_LIFE,
+    DEFAULT_FILTER_LIFE,
+    DEFAULT_LAMP_LIFE,
+    DOMAIN,
+    ERROR_STATUS_OPTIONS,
+    ERROR_STATUS_TO_OPTION,
+)
+from .coordinator import HitachiProjectorCoordinator
+from .stats import HitachiProjectorStats
+from .usage import HitachiProjectorUsageHistory
+
+USAGE_RATE_UNIT = f"{UnitOfTime.HOURS}/{UnitOfTime.DAYS}"
+
+
+@dataclass(frozen=True, kw_only=True)
+class HitachiProjectorSensorEntityDescription(SensorEntityDescription):
+    """Sensor showing a status register, mapped by the value function."""
+
+    register: str
+    value_fn: Callable[[Any], str | int | None] = lambda value: value
+
+
+@dataclass(frozen=True, kw_only=True)
+class HitachiProjectorStatsSensorEntityDescription(SensorEntityDescription):
+    """Diagnostic sensor showing a protocol call statistic."""
+
+    entity_category: EntityCategory | None = EntityCategory.DIAGNOSTIC
+    entity_registry_enabled_default: bool = False
+    stats_fn: Callable[[HitachiProjectorStats], float | int | None]
+
+
+@dataclass(frozen=True, kw_only=True)
+class HitachiProjectorUsageSensorEntityDescription(SensorEntityDescription):
+    """Sensor forecasting from the usage history of an hour counter."""
+
+    register: str
+    value_fn: Callable[[HitachiProjectorUsageHistory, Mapping[str, Any]], float | None]
+
+
+SENSORS: tuple[HitachiProjectorSensorEntityDescription, ...] = (
+    HitachiProjectorSensorEntityDescription(
+        key="error_status",
+        translation_key="error_status",
+        register="error_status",
+        device_class=SensorDeviceClass.ENUM,
+        options=ERROR_STATUS_OPTIONS,
+        value_fn=ERROR_STATUS_TO_OPTION.__getitem__,
+    ),
+    HitachiProjectorSensorEntityDescription(
+        key="filter_time",
+        translation_key="filter_time",
+        register="filter_time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=0,
+    ),
+    HitachiProjectorSensorEntityDescription(
+        key="lamp_time",
+        translation_key="lamp_time",
+        register="lamp_time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=0,
+    ),
+    HitachiProjectorSensorEntityDescription(
+        key="volume",
+        translation_key="volume",
+        register="volume",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
+STATS_SENSORS: tuple[HitachiProjectorStatsSensorEntityDescription, ...] = (
+    HitachiProjectorStatsSensorEntityDescription(
+        key="command_latency",
+        translation_key="command_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        stats_fn=lambda stats: (
+            stats.latency * 1000 if stats.latency is not None else None
+        ),
+    ),
+    HitachiProjectorStatsSensorEntityDescription(
+        key="command_failures",
+        translation_key="command_failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        stats_fn=attrgetter("failures"),
+    ),
+    HitachiProjectorStatsSensorEntityDescription(
+        key="command_timeouts",
+        translation_key="command_timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        stats_fn=attrgetter("timeouts"),
+    ),
+    HitachiProjectorStatsSensorEntityDescription(
+        key="auth_failures",
+        translation_key="auth_failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        stats_fn=attrgetter("auth_failures"),
+    ),
+    HitachiProjectorStatsSensorEntityDescription(
+        key="reconnects",
+        translation_key="reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        stats_fn=attrgetter("reconnects"),
+    ),
+)
+
+
+USAGE_SENSORS: tuple[HitachiProjectorUsageSensorEntityDescription, ...] = (
+    HitachiProjectorUsageSensorEntityDescription(
+        key="lamp_usage_rate",
+        translation_key="lamp_usage_rate",
+        register="lamp_time",
+        native_unit_of_measurement=USAGE_RATE_UNIT,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda history, options: history.rate("lamp_time"),
+    ),
+    HitachiProjectorUsageSensorEntityDescription(
+        key="filter_usage_rate",
+        translation_key="filter_usage_rate",
+        register="filter_time",
+        native_unit_of_measurement=USAGE_RATE_UNIT,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda history, options: history.rate("filter_time"),
+    ),
+    HitachiProjectorUsageSensorEntityDescription(
+        key="lamp_remaining",
+        translation_key="lamp_remaining",
+        register="lamp_time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        suggested_display_precision=0,
+        value_fn=lambda history, options: history.days_until(
+            "lamp_time", options.get(CONF_LAMP_LIFE, DEFAULT_LAMP_LIFE)
+        ),
+    ),
+    HitachiProjectorUsageSensorEntityDescription(
+        key="filter_remaining",
+        translation_key="filter_remaining",
+        register="filter_time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        suggested_display_precision=0,
+        value_fn=lambda history, options: history.days_until(
+            "filter_time", options.get(CONF_FILTER_LIFE, DEFAULT_FILTER_LIFE)
+        ),
+    ),
+)
 
 
 async def async_setup_entry(
@@ -25,35 +185,67 @@ async def async_setup_entry(
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Add switches for passed config_entry in HA."""
+    """Add sensors for passed config_entry in HA."""
 
     provider = config_entry.runtime_data
+    entry_id = config_entry.entry_id
 
-    async_add_entities(
+    async_add_supported_entities(
+        async_add_entities,
+        config_entry,
         [
-            HitachiProjectorErrorStatusSensor(provider, config_entry.entry_id),
-            HitachiProjectorFilterTimeSensor(provider, config_entry.entry_id),
-            HitachiProjectorLampTimeSensor(provider, config_entry.entry_id),
-        ]
+            *(
+                HitachiProjectorSensor(provider, entry_id, description)
+                for description in SENSORS
+            ),
+            *(
+                HitachiProjectorUsageSensor(provider, entry_id, description)
+                for description in USAGE_SENSORS
+            ),
+            *(
+                HitachiProjectorStatsSensor(provider, entry_id, description)
+                for description in STATS_SENSORS
+            ),
+        ],
     )
 
 
-class HitachiProjectorBaseSensor(SensorEntity):
+class HitachiProjectorBaseSensor(
+    CoordinatorEntity[HitachiProjectorCoordinator], SensorEntity
+):
     """Representation of device sensor."""
 
-    key: str
     entry_id: str
 
-    def __init__(self, provider: HitachiProvider, entry_id: str, key: str) -> None:
-        """Initialize the media player."""
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        provider: HitachiProvider,
+        entry_id: str,
+        description: SensorEntityDescription,
+        context: tuple[str, ...] | None = None,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(provider.coordinator, context=context)
+        self.entity_description = description
         self.provider = provider
-        self.key = key
         self.entry_id = entry_id
 
-        self._attr_unique_id = f"hitachiprojector_{self.entry_id}_{self.key}"
+        self._attr_unique_id = f"hitachiprojector_{entry_id}_{description.key}"
+
+        self._async_update_attrs()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._async_update_attrs()
+        super()._handle_coordinator_update()
 
-        self._attr_translation_key = self.key
-        self._attr_has_entity_name = True
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the latest snapshot."""
+        raise NotImplementedError
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -63,77 +255,91 @@ class HitachiProjectorBaseSensor(SensorEntity):
         }
 
 
-class HitachiProjectorErrorStatusSensor(HitachiProjectorBaseSensor):
-    """Representation of device sensor."""
+class HitachiProjectorSensor(HitachiProjectorBaseSensor):
+    """Sensor of a status register."""
 
-    _attr_device_class = SensorDeviceClass.ENUM
-    _attr_options = ERROR_STATUS_OPTIONS
+    entity_description: HitachiProjectorSensorEntityDescription
+    register: str
 
-    def __init__(self, provider: HitachiProvider, entry_id: str) -> None:
+    def __init__(
+        self,
+        provider: HitachiProvider,
+        entry_id: str,
+        description: HitachiProjectorSensorEntityDescription,
+    ) -> None:
         """Initialize the sensor."""
-        super().__init__(provider, entry_id, "error_status")
-
-    async def async_update(self) -> None:
-        """Retrieve latest state of the device."""
-        try:
-            (
-                reply_type,
-                status,
-            ) = await self.provider.hitachi_connection.get_error_status()
-            if reply_type != ReplyType.DATA or status is None:
-                raise InvalidStateError("Unexpected reply type")
-            self._attr_native_value = ERROR_STATUS_TO_OPTION[status]
-            self._attr_available = True
-        except (RuntimeError, HomeAssistantError):
-            self._attr_available = False
-
-
-class HitachiProjectorFilterTimeSensor(HitachiProjectorBaseSensor):
-    """Representation of device sensor."""
+        self.register = description.register
+        self._get_value = attrgetter(description.register)
+        super().__init__(provider, entry_id, description, (description.register,))
 
-    _attr_device_class = SensorDeviceClass.DURATION
-    _attr_native_unit_of_measurement = UnitOfTime.HOURS
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-    _attr_suggested_display_precision = 0
+    @property
+    def available(self) -> bool:
+        """Return if the projector answered the status query for this sensor."""
+        return super().available and self._attr_native_value is not None
 
-    def __init__(self, provider: HitachiProvider, entry_id: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(provider, entry_id, "filter_time")
-
-    async def async_update(self) -> None:
-        """Retrieve latest state of the device."""
-        try:
-            (
-                reply_type,
-                status,
-            ) = await self.provider.hitachi_connection.get_filter_time()
-            if reply_type != ReplyType.DATA or status is None:
-                raise InvalidStateError("Unexpected reply type")
-            self._attr_native_value = status
-            self._attr_available = True
-        except (RuntimeError, HomeAssistantError):
-            self._attr_available = False
-
-
-class HitachiProjectorLampTimeSensor(HitachiProjectorBaseSensor):
-    """Representation of device sensor."""
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the latest snapshot."""
+        data = self.coordinator.data
+        value = None if data is None else self._get_value(data)
+        self._attr_native_value = (
+            None if value is None else self.entity_description.value_fn(value)
+        )
+
+
+class HitachiProjectorStatsSensor(HitachiProjectorBaseSensor):
+    """Diagnostic sensor reporting protocol call statistics."""
 
-    _attr_device_class = SensorDeviceClass.DURATION
-    _attr_native_unit_of_measurement = UnitOfTime.HOURS
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-    _attr_suggested_display_precision = 0
+    entity_description: HitachiProjectorStatsSensorEntityDescription
 
-    def __init__(self, provider: HitachiProvider, entry_id: str) -> None:
+    @property
+    def available(self) -> bool:
+        """Return True, statistics matter most while the projector is unreachable."""
+        return True
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the protocol statistics."""
+        self._attr_native_value = self.entity_description.stats_fn(
+            self.provider.transport.stats
+        )
+
+
+class HitachiProjectorUsageSensor(HitachiProjectorBaseSensor):
+    """Sensor forecasting from the usage history of an hour counter."""
+
+    entity_description: HitachiProjectorUsageSensorEntityDescription
+    register: str
+
+    def __init__(
+        self,
+        provider: HitachiProvider,
+        entry_id: str,
+        description: HitachiProjectorUsageSensorEntityDescription,
+    ) -> None:
         """Initialize the sensor."""
-        super().__init__(provider, entry_id, "lamp_time")
-
-    async def async_update(self) -> None:
-        """Retrieve latest state of the device."""
-        try:
-            reply_type, status = await self.provider.hitachi_connection.get_lamp_time()
-            if reply_type != ReplyType.DATA or status is None:
-                raise InvalidStateError("Unexpected reply type")
-            self._attr_native_value = status
-            self._attr_available = True
-        except (RuntimeError, HomeAssistantError):
-            self._attr_available = False
+        self.register = description.register
+        super().__init__(provider, entry_id, description, (description.register,))
+
+    async def async_added_to_hass(self) -> None:
+        """Follow option changes, which may change the forecast."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.config_entry.add_update_listener(
+                self._async_options_updated
+            )
+        )
+
+    async def _async_options_updated(
+        self, hass: HomeAssistant, entry: ConfigEntry
+    ) -> None:
+        """Update the forecast with the new options."""
+        self._async_update_attrs()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the usage history."""
+        self._attr_native_value = self.entity_description.value_fn(
+            self.provider.usage_history, self.coordinator.config_entry.options
+        )
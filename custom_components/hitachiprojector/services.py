@@ -0,0 +1,262 @@
+"""Services for the Hitachi Projector integration."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+from libhitachiprojector.hitachiprojector import InputSource
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID, ENTITY_MATCH_ALL
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_extract_config_entry_ids
+
+from .command_queue import SceneStep
+from .const import (
+    BROADCAST_ATTEMPTS,
+    BROADCAST_CONCURRENCY,
+    BROADCAST_RETRY_DELAY,
+    DOMAIN,
+    SOURCE_TO_SET_COMMAND,
+)
+from .registers import REGISTERS
+
+if TYPE_CHECKING:
+    from . import HitachiProvider
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_CLEAR = "clear"
+ATTR_POWER = "power"
+ATTR_SOURCE = "source"
+ATTR_BLANK = "blank"
+ATTR_ECO_MODE = "eco_mode"
+ATTR_AUTO_ECO_MODE = "auto_eco_mode"
+ATTR_COMMAND = "command"
+
+SERVICE_DUMP_PROFILE = "dump_profile"
+SERVICE_APPLY_SCENE = "apply_scene"
+SERVICE_BROADCAST = "broadcast"
+
+# Switchable scene settings, with the status they set
+SCENE_SWITCHES = {
+    ATTR_POWER: "power_status",
+    ATTR_BLANK: "blank_status",
+    ATTR_ECO_MODE: "eco_mode_status",
+    ATTR_AUTO_ECO_MODE: "auto_eco_mode_status",
+}
+
+# Scene settings in the order they are applied, power is moved around the
+# others by the command queue
+SCENE_SETTINGS = (
+    ATTR_POWER,
+    ATTR_SOURCE,
+    ATTR_BLANK,
+    ATTR_ECO_MODE,
+    ATTR_AUTO_ECO_MODE,
+)
+
+# Broadcast commands, each turning a switchable setting on or off
+BROADCAST_COMMANDS = {
+    f"{attr}_{state}": (attr, state == "on")
+    for attr in SCENE_SWITCHES
+    for state in ("on", "off")
+}
+
+DUMP_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CLEAR, default=False): cv.boolean,
+    }
+)
+
+APPLY_SCENE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+            vol.Optional(ATTR_POWER): cv.boolean,
+            vol.Optional(ATTR_SOURCE): vol.In(SOURCE_TO_SET_COMMAND),
+            vol.Optional(ATTR_BLANK): cv.boolean,
+            vol.Optional(ATTR_ECO_MODE): cv.boolean,
+            vol.Optional(ATTR_AUTO_ECO_MODE): cv.boolean,
+        }
+    ),
+    cv.has_at_least_one_key(*SCENE_SETTINGS),
+)
+
+BROADCAST_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_COMMAND): vol.In(BROADCAST_COMMANDS),
+        **cv.ENTITY_SERVICE_FIELDS,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_dump_profile(call: ServiceCall) -> ServiceResponse:
+        """Return what the profiler of each projector recorded."""
+        if entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID):
+            entries = [_async_get_loaded_entry(hass, entry_id)]
+        else:
+            entries = hass.config_entries.async_loaded_entries(DOMAIN)
+
+        profiles = {}
+        for entry in entries:
+            profiler = entry.runtime_data.coordinator.profiler
+            profiles[entry.entry_id] = {"title": entry.title, **profiler.as_dict()}
+            if call.data[ATTR_CLEAR]:
+                profiler.clear()
+        return {"entries": profiles}
+
+    async def async_apply_scene(call: ServiceCall) -> ServiceResponse:
+        """Apply several settings to a projector and return per-step timings."""
+        entry = _async_get_loaded_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        provider = entry.runtime_data
+
+        steps = [
+            _scene_step(provider, attr, call.data[attr])
+            for attr in SCENE_SETTINGS
+            if attr in call.data
+        ]
+
+        start = time.monotonic()
+        results = await provider.command_queue.async_apply_scene(steps)
+        return {
+            "steps": results,
+            "duration": round(time.monotonic() - start, 3),
+        }
+
+    async def async_broadcast(call: ServiceCall) -> ServiceResponse:
+        """Send a command to every targeted projector at the same time."""
+        if call.data.get(ATTR_ENTITY_ID) == ENTITY_MATCH_ALL:
+            entries = hass.config_entries.async_loaded_entries(DOMAIN)
+        else:
+            entry_ids = await async_extract_config_entry_ids(call)
+            entries = [
+                entry
+                for entry in hass.config_entries.async_loaded_entries(DOMAIN)
+                if entry.entry_id in entry_ids
+            ]
+
+        attr, on = BROADCAST_COMMANDS[call.data[ATTR_COMMAND]]
+        semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+
+        async def async_send(entry: ConfigEntry) -> dict[str, Any]:
+            async with semaphore:
+                return await _async_broadcast_to(entry, attr, on)
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(async_send(entry) for entry in entries))
+        outcomes = [result["result"] for result in results]
+        return {
+            "projectors": {
+                entry.entry_id: result
+                for entry, result in zip(entries, results, strict=True)
+            },
+            "applied": outcomes.count("applied"),
+            "skipped": outcomes.count("skipped"),
+            "failed": outcomes.count("failed"),
+            "duration": round(time.monotonic() - start, 3),
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_PROFILE,
+        async_dump_profile,
+        schema=DUMP_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_SCENE,
+        async_apply_scene,
+        schema=APPLY_SCENE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BROADCAST,
+        async_broadcast,
+        schema=BROADCAST_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def _async_get_loaded_entry(hass: HomeAssistant, entry_id: str) -> ConfigEntry:
+    """Return a loaded config entry of the integration."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.state is not ConfigEntryState.LOADED
+    ):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"entry_id": entry_id},
+        )
+    return entry
+
+
+async def _async_broadcast_to(
+    entry: ConfigEntry, attr: str, on: bool
+) -> dict[str, Any]:
+    """Send a broadcast command to one projector, retrying it if it fails."""
+    result: dict[str, Any] = {"title": entry.title, "attempts": 0}
+    start = time.monotonic()
+    try:
+        step = _scene_step(entry.runtime_data, attr, on)
+        while True:
+            result["attempts"] += 1
+            (outcome,) = await entry.runtime_data.command_queue.async_apply_scene(
+                [step]
+            )
+            if outcome["result"] != "failed":
+                result["result"] = outcome["result"]
+                break
+            if result["attempts"] >= BROADCAST_ATTEMPTS:
+                raise HomeAssistantError(outcome["error"])
+            await asyncio.sleep(BROADCAST_RETRY_DELAY)
+    except HomeAssistantError as err:
+        # Covers unsupported settings and unreachable projectors, which are
+        # not worth retrying
+        result["result"] = "failed"
+        result["error"] = str(err)
+    result["duration"] = round(time.monotonic() - start, 3)
+    return result
+
+
+def _scene_step(provider: HitachiProvider, attr: str, setting: Any) -> SceneStep:
+    """Return the scene step applying a setting, if the projector supports it."""
+    if attr == ATTR_SOURCE:
+        register = REGISTERS["input_source"]
+        value = InputSource[setting]
+        supported = setting in provider.sources
+    else:
+        register = REGISTERS[SCENE_SWITCHES[attr]]
+        value = register.on_value if setting else register.off_value
+        supported = provider.supports(register.key)
+
+    if not supported:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="unsupported_setting",
+            translation_placeholders={
+                "setting": setting if attr == ATTR_SOURCE else attr
+            },
+        )
+    return SceneStep(register.key, value, register.set_commands[value])
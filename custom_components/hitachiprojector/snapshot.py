@@ -0,0 +1,112 @@
+"""Status snapshot of the Hitachi Projector integration, kept across restarts."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from enum import Enum
+import logging
+import time
+from typing import TYPE_CHECKING, Any, get_args, get_type_hints
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY
+from .coordinator import HitachiProjectorData
+
+if TYPE_CHECKING:
+    from .coordinator import HitachiProjectorCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+def _decoder(annotation: Any) -> Callable[[Any], Any]:
+    """Return how to restore a saved status of a type."""
+    for value_type in (annotation, *get_args(annotation)):
+        if isinstance(value_type, type) and issubclass(value_type, Enum):
+            return value_type.__getitem__
+    return int
+
+
+_DECODERS = {
+    name: _decoder(annotation)
+    for name, annotation in get_type_hints(HitachiProjectorData).items()
+}
+
+
+class HitachiProjectorSnapshot:
+    """Last known statuses of one projector, with when each was read.
+
+    Saved a while after statuses change and when Home Assistant stops, so the
+    entities start from them and only the statuses gone stale are polled.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the snapshot."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.snapshot.{entry_id}"
+        )
+        self._coordinator: HitachiProjectorCoordinator | None = None
+
+    async def async_load(self) -> tuple[HitachiProjectorData, dict[str, float]] | None:
+        """Load the statuses saved on a previous run, with their age in seconds."""
+        if (saved := await self._store.async_load()) is None:
+            return None
+
+        statuses: dict[str, Any] = {}
+        for name, value in saved["statuses"].items():
+            if value is None or name not in _DECODERS:
+                continue
+            try:
+                statuses[name] = _DECODERS[name](value)
+            except (KeyError, TypeError, ValueError):
+                # Saved by a version naming the value differently
+                _LOGGER.debug("Unable to restore %s=%s", name, value)
+        if "power_status" not in statuses:
+            return None
+
+        now = time.time()
+        ages = {
+            name: max(now - read_at, 0.0)
+            for name, read_at in saved["read_at"].items()
+            if name in statuses
+        }
+        return HitachiProjectorData(**statuses), ages
+
+    async def async_remove(self) -> None:
+        """Remove the saved snapshot."""
+        await self._store.async_remove()
+
+    async def async_flush(self) -> None:
+        """Save a scheduled snapshot right away, such as before a reload."""
+        if self._coordinator is not None:
+            await self._store.async_save(self._data_to_save())
+
+    @callback
+    def async_save_later(self, coordinator: HitachiProjectorCoordinator) -> None:
+        """Save the statuses of a coordinator once changes were collected."""
+        if self._coordinator is not None:
+            # A save is already scheduled and picks up the latest statuses
+            return
+        self._coordinator = coordinator
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the statuses to save."""
+        assert self._coordinator is not None
+        coordinator, self._coordinator = self._coordinator, None
+        data = coordinator.data
+
+        now = time.time()
+        return {
+            "statuses": {
+                name: value.name if isinstance(value, Enum) else value
+                for name, value in vars(data).items()
+            },
+            "read_at": {
+                name: now - age for name, age in coordinator.status_ages().items()
+            },
+        }
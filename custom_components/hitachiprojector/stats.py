@@ -0,0 +1,109 @@
+"""Protocol call statistics for the Hitachi Projector integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any
+
+# Upper bounds of the latency histogram buckets in seconds, the last bucket
+# counts everything slower
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Weight of the latest sample in the moving average latency
+LATENCY_SMOOTHING = 0.2
+
+
+@dataclass
+class CallStats:
+    """Counters and latency histogram for one kind of call."""
+
+    calls: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+
+    def record(self, latency: float, failed: bool, timed_out: bool) -> None:
+        """Record a finished call."""
+        self.calls += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.histogram[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        if failed:
+            self.failures += 1
+        if timed_out:
+            self.timeouts += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "mean_latency": self.total_latency / self.calls if self.calls else None,
+            "max_latency": self.max_latency,
+            "histogram": {
+                f"le_{bound}": count
+                for bound, count in zip(
+                    (*LATENCY_BUCKETS, "inf"), self.histogram, strict=True
+                )
+            },
+        }
+
+
+class HitachiProjectorStats:
+    """Statistics of every protocol call made for one config entry.
+
+    Connects count every time the session opened, including after it was
+    closed while idle or for PJLink. Reconnects only count the times it
+    opened again after a failure or after the projector dropped it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.calls: dict[str, CallStats] = {}
+        self.connects = 0
+        self.reconnects = 0
+        self.auth_failures = 0
+        self.latency: float | None = None
+
+    @property
+    def failures(self) -> int:
+        """Return the number of failed calls."""
+        return sum(stats.failures for stats in self.calls.values())
+
+    @property
+    def timeouts(self) -> int:
+        """Return the number of calls that timed out."""
+        return sum(stats.timeouts for stats in self.calls.values())
+
+    def record(
+        self, call: str, latency: float, failed: bool = False, timed_out: bool = False
+    ) -> None:
+        """Record a finished protocol call."""
+        if (stats := self.calls.get(call)) is None:
+            stats = self.calls[call] = CallStats()
+        stats.record(latency, failed, timed_out)
+
+        if not failed:
+            self.latency = (
+                latency
+                if self.latency is None
+                else self.latency + LATENCY_SMOOTHING * (latency - self.latency)
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all statistics for diagnostics."""
+        return {
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "auth_failures": self.auth_failures,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "latency": self.latency,
+            "calls": {call: stats.as_dict() for call, stats in self.calls.items()},
+        }
@@ -1,28 +1,50 @@
-"""Platform for media player integration."""
+"""Platform for switch integration."""
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from operator import attrgetter
 from typing import Any
 
-from libhitachiprojector.hitachiprojector import (
-    AutoEcoModeStatus,
-    BlankStatus,
-    Command,
-    EcoModeStatus,
-    HitachiProjectorConnection,
-    ReplyType,
-    commands,
-)
-
-from homeassistant.components.switch import SwitchEntity
+from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import HomeAssistantError, InvalidStateError
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import HitachiProvider
+from . import HitachiProvider, async_add_supported_entities
 from .const import DOMAIN
+from .coordinator import HitachiProjectorCoordinator
+from .registers import REGISTERS
+
+
+@dataclass(frozen=True, kw_only=True)
+class HitachiProjectorSwitchEntityDescription(SwitchEntityDescription):
+    """Switch turning a status register on and off."""
+
+    register: str
+
+
+SWITCHES: tuple[HitachiProjectorSwitchEntityDescription, ...] = (
+    HitachiProjectorSwitchEntityDescription(
+        key="blank_mode", translation_key="blank_mode", register="blank_status"
+    ),
+    HitachiProjectorSwitchEntityDescription(
+        key="eco_mode", translation_key="eco_mode", register="eco_mode_status"
+    ),
+    HitachiProjectorSwitchEntityDescription(
+        key="auto_eco_mode",
+        translation_key="auto_eco_mode",
+        register="auto_eco_mode_status",
+    ),
+    HitachiProjectorSwitchEntityDescription(
+        key="mute", translation_key="mute", register="mute_status"
+    ),
+    HitachiProjectorSwitchEntityDescription(
+        key="freeze", translation_key="freeze", register="freeze_status"
+    ),
+)
 
 
 async def async_setup_entry(
@@ -34,149 +56,84 @@ async def async_setup_entry(
 
     provider = config_entry.runtime_data
 
-    async_add_entities(
+    async_add_supported_entities(
+        async_add_entities,
+        config_entry,
         [
-            HitachiProjectorBlankModeSwitch(provider, config_entry.entry_id),
-            HitachiProjectorEcoModeSwitch(provider, config_entry.entry_id),
-            HitachiProjectorAutoEcoModeSwitch(provider, config_entry.entry_id),
-        ]
+            HitachiProjectorSwitch(provider, config_entry.entry_id, description)
+            for description in SWITCHES
+        ],
     )
 
 
-class HitachiProjectorBaseSwitch(SwitchEntity):
-    """Representation of device switch."""
+class HitachiProjectorSwitch(
+    CoordinatorEntity[HitachiProjectorCoordinator], SwitchEntity
+):
+    """Switch of a status register."""
 
-    key: str
+    entity_description: HitachiProjectorSwitchEntityDescription
     entry_id: str
+    register: str
 
-    def __init__(self, provider: HitachiProvider, entry_id: str, key: str) -> None:
-        """Initialize the media player."""
-        self.provider = provider
-        self.key = key
-        self.entry_id = entry_id
-
-        self._attr_unique_id = f"hitachiprojector_{self.entry_id}_{self.key}"
-
-        self._attr_translation_key = self.key
-        self._attr_has_entity_name = True
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Information about this entity/device."""
-        return {
-            "identifiers": {(DOMAIN, self.entry_id)},
-        }
-
-
-class HitachiProjectorBlankModeSwitch(HitachiProjectorBaseSwitch):
-    """Representation of device switch."""
+    _attr_has_entity_name = True
 
-    def __init__(self, provider: HitachiProvider, entry_id: str) -> None:
+    def __init__(
+        self,
+        provider: HitachiProvider,
+        entry_id: str,
+        description: HitachiProjectorSwitchEntityDescription,
+    ) -> None:
         """Initialize the switch."""
-        super().__init__(provider, entry_id, "blank_mode")
-
-    async def async_update(self) -> None:
-        """Retrieve latest state of the device."""
-        try:
-            (
-                reply_type,
-                status,
-            ) = await self.provider.hitachi_connection.get_blank_status()
-            if reply_type != ReplyType.DATA or status is None:
-                raise InvalidStateError("Unexpected reply type")
-            self._attr_is_on = status == BlankStatus.On
-            self._attr_available = True
-        except (RuntimeError, HomeAssistantError):
-            self._attr_available = False
-
-    async def async_turn_on(self, **kwargs: Any) -> None:
-        """Turn switch on."""
-        reply_type, _ = await self.provider.hitachi_connection.async_send_cmd(
-            commands[Command.BlankOn]
-        )
-        if reply_type != ReplyType.ACK:
-            raise InvalidStateError("Unexpected reply type")
+        super().__init__(provider.coordinator, context=(description.register,))
+        self.entity_description = description
+        self.provider = provider
+        self.entry_id = entry_id
+        self.register = description.register
 
-    async def async_turn_off(self, **kwargs: Any) -> None:
-        """Turn switch off."""
-        reply_type, _ = await self.provider.hitachi_connection.async_send_cmd(
-            commands[Command.BlankOff]
-        )
-        if reply_type != ReplyType.ACK:
-            raise InvalidStateError("Unexpected reply type")
+        register = REGISTERS[description.register]
+        self._on_value = register.on_value
+        self._on_command = register.set_commands[register.on_value]
+        self._off_value = register.off_value
+        self._off_command = register.set_commands[register.off_value]
+        self._get_value = attrgetter(description.register)
 
+        self._attr_unique_id = f"hitachiprojector_{entry_id}_{description.key}"
 
-class HitachiProjectorEcoModeSwitch(HitachiProjectorBaseSwitch):
-    """Representation of device switch."""
+        self._async_update_attrs()
 
-    def __init__(self, con: HitachiProjectorConnection, entry_id: str) -> None:
-        """Initialize the switch."""
-        super().__init__(con, entry_id, "eco_mode")
-
-    async def async_update(self) -> None:
-        """Retrieve latest state of the device."""
-        try:
-            (
-                reply_type,
-                status,
-            ) = await self.provider.hitachi_connection.get_eco_mode_status()
-            if reply_type != ReplyType.DATA or status is None:
-                raise InvalidStateError("Unexpected reply type")
-            self._attr_is_on = status == EcoModeStatus.Eco
-            self._attr_available = True
-        except (RuntimeError, HomeAssistantError):
-            self._attr_available = False
+    @property
+    def available(self) -> bool:
+        """Return if the projector answered the status query for this switch."""
+        return super().available and self._attr_is_on is not None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._async_update_attrs()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the latest snapshot."""
+        data = self.coordinator.data
+        value = None if data is None else self._get_value(data)
+        self._attr_is_on = None if value is None else value == self._on_value
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn switch on."""
-        reply_type, _ = await self.provider.hitachi_connection.async_send_cmd(
-            commands[Command.EcoModeEco]
+        await self.provider.command_queue.async_send(
+            self.register, self._on_value, self._on_command
         )
-        if reply_type != ReplyType.ACK:
-            raise InvalidStateError("Unexpected reply type")
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn switch off."""
-        reply_type, _ = await self.provider.hitachi_connection.async_send_cmd(
-            commands[Command.EcoModeNormal]
-        )
-        if reply_type != ReplyType.ACK:
-            raise InvalidStateError("Unexpected reply type")
-
-
-class HitachiProjectorAutoEcoModeSwitch(HitachiProjectorBaseSwitch):
-    """Representation of device switch."""
-
-    def __init__(self, con: HitachiProjectorConnection, entry_id: str) -> None:
-        """Initialize the switch."""
-        super().__init__(con, entry_id, "auto_eco_mode")
-
-    async def async_update(self) -> None:
-        """Retrieve latest state of the device."""
-        try:
-            (
-                reply_type,
-                status,
-            ) = await self.provider.hitachi_connection.get_auto_eco_mode_status()
-            if reply_type != ReplyType.DATA or status is None:
-                raise InvalidStateError("Unexpected reply type")
-            self._attr_is_on = status == AutoEcoModeStatus.On
-            self._attr_available = True
-        except (RuntimeError, HomeAssistantError):
-            self._attr_available = False
-
-    async def async_turn_on(self, **kwargs: Any) -> None:
-        """Turn switch on."""
-        reply_type, _ = await self.provider.hitachi_connection.async_send_cmd(
-            commands[Command.AutoEcoModeOn]
+        await self.provider.command_queue.async_send(
+            self.register, self._off_value, self._off_command
         )
-        if reply_type != ReplyType.ACK:
-            raise InvalidStateError("Unexpected reply type")
 
-    async def async_turn_off(self, **kwargs: Any) -> None:
-        """Turn switch off."""
-        reply_type, _ = await self.provider.hitachi_connection.async_send_cmd(
-            commands[Command.AutoEcoModeOff]
-        )
-        if reply_type != ReplyType.ACK:
-            raise InvalidStateError("Unexpected reply type")
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Information about this entity/device."""
+        return {
+            "identifiers": {(DOMAIN, self.entry_id)},
+        }
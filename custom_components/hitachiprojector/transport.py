@@ -0,0 +1,138 @@
+"""Every connection of the Hitachi Projector integration to one projector."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+import time
+from typing import Any
+
+from libhitachiprojector.hitachiprojector import PORT
+
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .connection import HitachiProjectorSession
+from .const import PJLINK_INPUT_TO_SOURCE, PJLINK_TIMEOUT, SOURCE_TO_SET_COMMAND
+from .pjlink import PJLINK_PORT, PJLinkAuthError, PJLinkClient, PJLinkError
+from .profiler import HitachiProjectorProfiler
+from .registers import HitachiProjectorRegister
+from .stats import HitachiProjectorStats
+
+
+class HitachiProjectorTransport:
+    """Hitachi and PJLink protocols of a projector, one connection at a time.
+
+    Projectors handle concurrent connections badly, so the Hitachi session is
+    closed and held while PJLink runs, and reopened on its next frame. Each
+    query goes over the protocol answering it fastest: statuses and commands
+    over the persistent Hitachi session, the identity and the inputs, which
+    the Hitachi protocol has no query for, over PJLink.
+    """
+
+    host: str
+    stats: HitachiProjectorStats
+    profiler: HitachiProjectorProfiler
+
+    def __init__(
+        self,
+        host: str,
+        password: str,
+        port: int = PORT,
+        pjlink_port: int = PJLINK_PORT,
+        pjlink_timeout: float = PJLINK_TIMEOUT,
+        stats: HitachiProjectorStats | None = None,
+        profiler: HitachiProjectorProfiler | None = None,
+    ) -> None:
+        """Initialize the transport."""
+        self.host = host
+        self.stats = stats or HitachiProjectorStats()
+        self.profiler = profiler or HitachiProjectorProfiler()
+        self.session = HitachiProjectorSession(
+            host, password, port, self.stats, self.profiler
+        )
+        self._password = password
+        self._pjlink_port = pjlink_port
+        self._pjlink_timeout = pjlink_timeout
+
+    @property
+    def connected(self) -> bool:
+        """Return if the Hitachi session is currently open."""
+        return self.session.connected
+
+    async def async_send_cmd(
+        self, cmd: bytes, parse: Callable[[memoryview], Any] | None = None
+    ) -> tuple:
+        """Send a command frame and return the reply."""
+        return await self.session.async_send_cmd(cmd, parse)
+
+    async def async_read(self, register: HitachiProjectorRegister) -> tuple:
+        """Read a status register and return the reply with its parsed value."""
+        return await self.session.async_read(register)
+
+    async def get_power_status(self) -> tuple:
+        """Get the power status."""
+        return await self.session.get_power_status()
+
+    async def async_get_device_info(self) -> DeviceInfo:
+        """Query the projector identity over a single connection."""
+        return await self._async_query("pjlink_identity", _async_query_identity)
+
+    async def async_get_sources(self) -> list[str]:
+        """Query which of the known input sources the projector has."""
+        inputs = await self._async_query("pjlink_inputs", PJLinkClient.async_get_inputs)
+        sources = {
+            PJLINK_INPUT_TO_SOURCE[number]
+            for number in inputs
+            if number in PJLINK_INPUT_TO_SOURCE
+        }
+        if not sources:
+            # Inputs this model numbers differently, keep offering every source
+            return list(SOURCE_TO_SET_COMMAND)
+        return [source for source in SOURCE_TO_SET_COMMAND if source in sources]
+
+    def expect_next_use(self, delay: float) -> None:
+        """Tell the Hitachi session when it is next needed, in seconds from now."""
+        self.session.expect_next_use(delay)
+
+    async def async_close(self) -> None:
+        """Close the Hitachi session."""
+        await self.session.async_close()
+
+    async def _async_query[T](
+        self, call: str, query: Callable[[PJLinkClient], Awaitable[T]]
+    ) -> T:
+        """Run PJLink queries over a single connection, profiled if enabled."""
+        return await self.profiler.wrap(call, self._async_run_query(call, query))
+
+    async def _async_run_query[T](
+        self, call: str, query: Callable[[PJLinkClient], Awaitable[T]]
+    ) -> T:
+        """Run PJLink queries in place of the session, recording their outcome."""
+        async with self.session.async_suspend():
+            start = time.monotonic()
+            try:
+                async with PJLinkClient(
+                    self.host, self._password, self._pjlink_port, self._pjlink_timeout
+                ) as client:
+                    result = await query(client)
+            except PJLinkError as err:
+                self.stats.record(
+                    call,
+                    time.monotonic() - start,
+                    failed=True,
+                    timed_out=isinstance(err.__cause__, TimeoutError),
+                )
+                if isinstance(err, PJLinkAuthError):
+                    self.stats.auth_failures += 1
+                raise
+
+        self.stats.record(call, time.monotonic() - start)
+        return result
+
+
+async def _async_query_identity(client: PJLinkClient) -> DeviceInfo:
+    """Query the name, manufacturer and model of a projector."""
+    return DeviceInfo(
+        name=await client.async_get_name(),
+        manufacturer=await client.async_get_manufacturer(),
+        model=await client.async_get_product_name(),
+    )
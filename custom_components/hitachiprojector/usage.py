@@ -0,0 +1,114 @@
+"""Lamp and filter usage history of the Hitachi Projector integration."""
+
+from __future__ import annotations
+
+from collections import deque
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, USAGE_HISTORY_DAYS, USAGE_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Hour counters with a usage history
+USAGE_COUNTERS = ("lamp_time", "filter_time")
+
+
+class HitachiProjectorUsageHistory:
+    """Daily samples of the hour counters of one projector.
+
+    Each counter keeps its last reading of every day in a ring buffer, which
+    is persisted and gives the usage rate over the buffered days. A counter
+    going down was reset after a replacement, which restarts its history.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the usage history."""
+        self._store: Store[dict[str, list[list[int]]]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.usage.{entry_id}"
+        )
+        self._samples: dict[str, deque[tuple[int, int]]] = {
+            counter: deque(maxlen=USAGE_HISTORY_DAYS) for counter in USAGE_COUNTERS
+        }
+        self._rates: dict[str, float | None] = dict.fromkeys(USAGE_COUNTERS)
+
+    async def async_load(self) -> None:
+        """Load the samples saved on a previous run."""
+        if (data := await self._store.async_load()) is None:
+            return
+        for counter, samples in self._samples.items():
+            samples.extend((day, hours) for day, hours in data.get(counter, ()))
+            self._update_rate(counter)
+
+    async def async_remove(self) -> None:
+        """Remove the saved samples."""
+        await self._store.async_remove()
+
+    @callback
+    def async_record(self, counter: str, hours: int) -> None:
+        """Record a counter reading as the latest sample of today."""
+        samples = self._samples[counter]
+        day = dt_util.now().date().toordinal()
+
+        if samples:
+            last_day, last_hours = samples[-1]
+            if last_day == day and hours == last_hours:
+                return
+            if hours < last_hours:
+                _LOGGER.debug(
+                    "%s went from %s to %s, reset", counter, last_hours, hours
+                )
+                samples.clear()
+            elif last_day >= day:
+                samples.pop()
+        samples.append((day, hours))
+
+        self._update_rate(counter)
+        self._store.async_delay_save(self._data_to_save, USAGE_SAVE_DELAY)
+
+    def rate(self, counter: str) -> float | None:
+        """Return the hours a counter goes up per day, if known."""
+        return self._rates[counter]
+
+    def days_until(self, counter: str, limit: int) -> float | None:
+        """Return the days until a counter reaches a limit at the current rate."""
+        if not (samples := self._samples[counter]):
+            return None
+        if (remaining := limit - samples[-1][1]) <= 0:
+            return 0.0
+        if not (rate := self._rates[counter]):
+            return None
+        return remaining / rate
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the samples and rates for diagnostics."""
+        return {
+            counter: {
+                "samples": len(samples),
+                "rate": self._rates[counter],
+            }
+            for counter, samples in self._samples.items()
+        }
+
+    def _update_rate(self, counter: str) -> None:
+        """Compute the rate between the first and the last sample."""
+        samples = self._samples[counter]
+        if len(samples) < 2 or samples[-1][0] <= samples[0][0]:
+            self._rates[counter] = None
+            return
+        (first_day, first_hours), (last_day, last_hours) = samples[0], samples[-1]
+        self._rates[counter] = (last_hours - first_hours) / (last_day - first_day)
+
+    @callback
+    def _data_to_save(self) -> dict[str, list[list[int]]]:
+        """Return the samples to save."""
+        return {
+            counter: [[day, hours] for day, hours in samples]
+            for counter, samples in self._samples.items()
+        }
@@ -0,0 +1,239 @@
+"""Benchmark the integration against simulated projectors.
+
+Sets up one config entry per simulated projector in a test instance of Home
+Assistant, then reports round trips, wall time and event loop blocking for
+the setup, a number of poll cycles and a burst of commands:
+
+    python scripts/benchmark.py --count 16 --cycles 5 --latency 0.02
+
+Requires pytest-homeassistant-custom-component for the test instance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+from simulator import (
+    ProjectorSimulator,
+    add_behavior_arguments,
+    async_start_simulators,
+    behavior_from_arguments,
+)
+
+from homeassistant import loader
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+DOMAIN = "hitachiprojector"
+
+# How often the loop lag probe wakes up
+PROBE_INTERVAL = 0.005
+
+
+class LoopLagProbe:
+    """Measure how late the event loop runs a callback that is due regularly."""
+
+    def __init__(self) -> None:
+        """Initialize the probe."""
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    def reset(self) -> None:
+        """Start measuring from zero."""
+        self.max_lag = self.total_lag = 0.0
+
+    def start(self) -> None:
+        """Start probing."""
+        self._task = asyncio.create_task(self._async_run())
+
+    def stop(self) -> None:
+        """Stop probing."""
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _async_run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + PROBE_INTERVAL
+            await asyncio.sleep(PROBE_INTERVAL)
+            lag = max(loop.time() - due, 0.0)
+            self.max_lag = max(self.max_lag, lag)
+            self.total_lag += lag
+
+
+@dataclass
+class Measurement:
+    """Cost of one benchmarked step."""
+
+    name: str
+    round_trips: int
+    connections: int
+    wall_time: float
+    max_lag: float
+    total_lag: float
+
+    def __str__(self) -> str:
+        """Format as one report line."""
+        return (
+            f"{self.name:<16} {self.round_trips:>8} {self.connections:>8} "
+            f"{self.wall_time * 1000:>10.1f} {self.max_lag * 1000:>10.1f} "
+            f"{self.total_lag * 1000:>10.1f}"
+        )
+
+
+HEADER = (
+    f"{'step':<16} {'trips':>8} {'connects':>8} "
+    f"{'wall ms':>10} {'max lag ms':>10} {'lag ms':>10}"
+)
+
+
+class Benchmark:
+    """Run and report benchmark steps against a set of simulators."""
+
+    def __init__(self, simulators: list[ProjectorSimulator]) -> None:
+        """Initialize the benchmark."""
+        self.simulators = simulators
+        self.probe = LoopLagProbe()
+        self.results: list[Measurement] = []
+
+    async def async_measure(self, name: str, step: Awaitable) -> Measurement:
+        """Run a step and record its cost."""
+        for simulator in self.simulators:
+            simulator.reset_counters()
+        self.probe.reset()
+
+        start = time.perf_counter()
+        await step
+        wall_time = time.perf_counter() - start
+
+        counters = [simulator.reset_counters() for simulator in self.simulators]
+        measurement = Measurement(
+            name,
+            sum(counter.round_trips for counter in counters),
+            sum(counter.connections for counter in counters),
+            wall_time,
+            self.probe.max_lag,
+            self.probe.total_lag,
+        )
+        self.results.append(measurement)
+        print(measurement)
+        return measurement
+
+
+@asynccontextmanager
+async def async_home_assistant() -> AsyncIterator[HomeAssistant]:
+    """Start a test instance of Home Assistant that loads this integration."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with async_test_home_assistant(config_dir=config_dir) as hass:
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+            yield hass
+            await hass.async_stop(force=True)
+
+
+async def async_setup_entries(
+    hass: HomeAssistant, entries: list[MockConfigEntry]
+) -> None:
+    """Set up every config entry at the same time.
+
+    Also waits for the capability probe and the reload that may follow it.
+    """
+    await asyncio.gather(
+        *(hass.config_entries.async_setup(entry.entry_id) for entry in entries)
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def async_poll_cycle(entries: list[MockConfigEntry]) -> None:
+    """Poll every projector once."""
+    await asyncio.gather(
+        *(entry.runtime_data.coordinator.async_refresh() for entry in entries)
+    )
+
+
+async def async_command_burst(
+    hass: HomeAssistant, entries: list[MockConfigEntry], commands: int
+) -> None:
+    """Toggle blank on every projector a number of times."""
+    entity_registry = er.async_get(hass)
+    entity_ids = [
+        entity_registry.async_get_entity_id(
+            "switch", DOMAIN, f"hitachiprojector_{entry.entry_id}_blank_mode"
+        )
+        for entry in entries
+    ]
+    for index in range(commands):
+        service = "turn_on" if index % 2 == 0 else "turn_off"
+        await hass.services.async_call(
+            "switch", service, {"entity_id": entity_ids}, blocking=True
+        )
+
+
+async def async_unload_entries(
+    hass: HomeAssistant, entries: list[MockConfigEntry]
+) -> None:
+    """Unload every config entry."""
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def async_main(args: argparse.Namespace) -> None:
+    """Run the benchmark."""
+    simulators = await async_start_simulators(
+        args.count, args.password, behavior_from_arguments(args)
+    )
+    benchmark = Benchmark(simulators)
+
+    try:
+        async with async_home_assistant() as hass:
+            entries = [
+                MockConfigEntry(
+                    domain=DOMAIN,
+                    title=simulator.name,
+                    data={"host": simulator.host, "password": args.password or ""},
+                )
+                for simulator in simulators
+            ]
+            for entry in entries:
+                entry.add_to_hass(hass)
+
+            benchmark.probe.start()
+            print(HEADER)
+            await benchmark.async_measure("setup", async_setup_entries(hass, entries))
+            for cycle in range(args.cycles):
+                await benchmark.async_measure(
+                    f"poll {cycle + 1}", async_poll_cycle(entries)
+                )
+            await benchmark.async_measure(
+                "commands", async_command_burst(hass, entries, args.commands)
+            )
+            await benchmark.async_measure("unload", async_unload_entries(hass, entries))
+            benchmark.probe.stop()
+    finally:
+        for simulator in simulators:
+            await simulator.async_stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_behavior_arguments(parser)
+    parser.add_argument("--cycles", type=int, default=3, help="poll cycles to run")
+    parser.add_argument(
+        "--commands", type=int, default=4, help="commands per projector"
+    )
+    asyncio.run(async_main(parser.parse_args()))
@@ -0,0 +1,95 @@
+"""Micro-benchmark building packets and parsing replies of the Hitachi protocol.
+
+Compares the protocol library, which builds every packet and copies every
+reply, with the integration, which reuses prebuilt packets and parses replies
+straight from its receive buffer:
+
+    python scripts/frame_benchmark.py --number 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+import sys
+import timeit
+
+from libhitachiprojector.hitachiprojector import (
+    Command,
+    PowerStatus,
+    ReplyType,
+    commands,
+    make_packet,
+    parse_reply,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.hitachiprojector.connection import (
+    _CONNECTION_IDS,
+    _PACKETS,
+    _REPLY_TYPES,
+)
+from custom_components.hitachiprojector.registers import FRAMES, REGISTERS
+
+# Data reply to a power status query, with its connection id
+REPLY = bytes([0x1D, 0x01, 0x00, 0x2A])
+# The same reply in a receive buffer, as the integration parses it
+REPLY_BUFFER = memoryview(bytearray(REPLY))
+
+_POWER_STATUSES = {member.value.to_bytes(2, "big"): member for member in PowerStatus}
+
+
+def library_packet() -> bytes:
+    """Build a packet the way the protocol library does."""
+    return make_packet(commands[Command.PowerGet])[0]
+
+
+def integration_packet() -> bytes:
+    """Build a packet the way the integration does."""
+    return _PACKETS[FRAMES[Command.PowerGet]] + _CONNECTION_IDS[0x2A]
+
+
+def library_reply(reply: bytes = REPLY) -> PowerStatus:
+    """Parse a reply the way the protocol library does."""
+    _, data = parse_reply(ReplyType(reply[0]), reply)
+    return _POWER_STATUSES[bytes(data)]
+
+
+def integration_reply(
+    reply: memoryview = REPLY_BUFFER,
+    parse=REGISTERS["power_status"].parse,
+) -> PowerStatus:
+    """Parse a reply the way the integration does."""
+    _REPLY_TYPES.get(reply[0])
+    return parse(reply[1:3])
+
+
+def measure(name: str, library, integration, number: int) -> None:
+    """Print the time per call of both implementations."""
+    before = min(timeit.repeat(library, number=number, repeat=5)) / number
+    after = min(timeit.repeat(integration, number=number, repeat=5)) / number
+    print(
+        f"{name:<8} library {before * 1e9:8.0f} ns  integration "
+        f"{after * 1e9:8.0f} ns  saved {(before - after) / before:6.1%}"
+    )
+
+
+def main(args: argparse.Namespace) -> None:
+    """Run the benchmark."""
+    # Home Assistant runs with the library's debug logging disabled
+    logging.getLogger("libhitachiprojector").setLevel(logging.INFO)
+    # Both build the same packet, up to the connection id
+    assert library_packet()[:-1] == integration_packet()[:-1]
+    assert library_reply() is integration_reply()
+    measure("packet", library_packet, integration_packet, args.number)
+    measure("reply", library_reply, integration_reply, args.number)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--number", type=int, default=100000, help="calls per measurement"
+    )
+    main(parser.parse_args())
@@ -0,0 +1,316 @@
+"""Simulated Hitachi projectors speaking the binary control protocol and PJLink.
+
+Run standalone to serve projectors on consecutive loopback addresses:
+
+    python scripts/simulator.py --count 4 --latency 0.05 --password secret
+
+Projector n listens on 127.0.0.(n + 1), on the Hitachi control port 9715 and
+the PJLink port 4352, so a config entry only needs the address. Linux routes
+all of 127.0.0.0/8 to the loopback interface, other platforms may need the
+extra addresses to be configured first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+from hashlib import md5
+import logging
+import random
+import secrets
+
+_LOGGER = logging.getLogger(__name__)
+
+HITACHI_PORT = 9715
+PJLINK_PORT = 4352
+
+FRAME_HEADER = 0x02
+FRAME_LENGTH = 17
+DIGEST_LENGTH = 32
+NONCE_LENGTH = 8
+
+ACTION_SET = bytes.fromhex("0100")
+ACTION_GET = bytes.fromhex("0200")
+
+REPLY_ACK = 0x06
+REPLY_ERROR = 0x1C
+REPLY_DATA = 0x1D
+AUTH_FAILURE = bytes([0x1F, 0x04, 0x00])
+
+# Register type codes and their value on power up. Counters are little endian,
+# every other register is big endian.
+INITIAL_REGISTERS = {
+    bytes.fromhex("0060"): bytes.fromhex("0100"),  # power, on
+    bytes.fromhex("0020"): bytes.fromhex("0300"),  # input source, HDMI
+    bytes.fromhex("2060"): bytes.fromhex("0000"),  # error status, normal
+    bytes.fromhex("a010"): (1200).to_bytes(2, "little"),  # filter time
+    bytes.fromhex("9010"): (3400).to_bytes(2, "little"),  # lamp time
+    bytes.fromhex("2030"): bytes.fromhex("0000"),  # blank, off
+    bytes.fromhex("0033"): bytes.fromhex("0100"),  # eco mode, eco
+    bytes.fromhex("1033"): bytes.fromhex("0000"),  # auto eco mode, off
+    bytes.fromhex("0220"): bytes.fromhex("0000"),  # mute, off
+    bytes.fromhex("0230"): bytes.fromhex("0000"),  # freeze, normal
+    bytes.fromhex("0120"): (16).to_bytes(2, "little"),  # volume
+    bytes.fromhex("ba30"): bytes.fromhex("0000"),  # picture mode, normal
+}
+
+
+@dataclass
+class SimulatorCounters:
+    """What a simulated projector has seen since the counters were reset."""
+
+    connections: int = 0
+    frames: int = 0
+    dropped: int = 0
+    auth_failures: int = 0
+    pjlink_requests: int = 0
+
+    @property
+    def round_trips(self) -> int:
+        """Return the number of requests answered over either protocol."""
+        return self.frames + self.pjlink_requests
+
+
+@dataclass
+class SimulatorBehavior:
+    """How a simulated projector misbehaves."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    drop_rate: float = 0.0
+    auth_failure_rate: float = 0.0
+
+    async def async_delay(self) -> None:
+        """Wait as long as a reply takes."""
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@dataclass
+class ProjectorSimulator:
+    """One simulated projector."""
+
+    host: str
+    password: str | None = None
+    name: str = "Projector"
+    behavior: SimulatorBehavior = field(default_factory=SimulatorBehavior)
+    hitachi_port: int = HITACHI_PORT
+    pjlink_port: int = PJLINK_PORT
+
+    registers: dict[bytes, bytes] = field(
+        default_factory=lambda: dict(INITIAL_REGISTERS)
+    )
+    counters: SimulatorCounters = field(default_factory=SimulatorCounters)
+    open_connections: int = 0
+
+    _servers: list[asyncio.Server] = field(default_factory=list)
+
+    async def async_start(self) -> ProjectorSimulator:
+        """Start listening on both protocol ports."""
+        self._servers = [
+            await asyncio.start_server(
+                self._async_handle_hitachi, self.host, self.hitachi_port
+            ),
+            await asyncio.start_server(
+                self._async_handle_pjlink, self.host, self.pjlink_port
+            ),
+        ]
+        return self
+
+    async def async_stop(self) -> None:
+        """Stop listening and drop every connection."""
+        for server in self._servers:
+            server.close()
+            server.close_clients()
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers = []
+
+    def reset_counters(self) -> SimulatorCounters:
+        """Return the counters so far and start counting from zero."""
+        counters, self.counters = self.counters, SimulatorCounters()
+        return counters
+
+    async def _async_handle_hitachi(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one connection to the control port."""
+        self.counters.connections += 1
+        self.open_connections += 1
+
+        nonce = None
+        digest = None
+        if self.password:
+            nonce = secrets.token_hex(NONCE_LENGTH // 2).encode()
+            digest = md5(nonce + self.password.encode()).hexdigest().encode()
+            writer.write(nonce)
+
+        try:
+            while True:
+                frame, frame_digest = await self._async_read_frame(reader)
+                connection_id = frame[-1]
+
+                if digest is not None and frame_digest != digest:
+                    writer.write(AUTH_FAILURE + bytes([connection_id]))
+                    await writer.drain()
+                    continue
+
+                if random.random() < self.behavior.drop_rate:
+                    self.counters.dropped += 1
+                    continue
+
+                if random.random() < self.behavior.auth_failure_rate:
+                    self.counters.auth_failures += 1
+                    writer.write(AUTH_FAILURE + bytes([connection_id]))
+                    await writer.drain()
+                    continue
+
+                self.counters.frames += 1
+                await self.behavior.async_delay()
+                writer.write(self._reply(frame[2:15]) + bytes([connection_id]))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.open_connections -= 1
+            writer.close()
+
+    async def _async_read_frame(
+        self, reader: asyncio.StreamReader
+    ) -> tuple[bytes, bytes | None]:
+        """Read one frame and the digest in front of it, if any."""
+        first = await reader.readexactly(1)
+        if first[0] == FRAME_HEADER:
+            return first + await reader.readexactly(FRAME_LENGTH - 1), None
+
+        digest = first + await reader.readexactly(DIGEST_LENGTH - 1)
+        return await reader.readexactly(FRAME_LENGTH), digest
+
+    def _reply(self, command: bytes) -> bytes:
+        """Apply a command to the registers and build the reply."""
+        action, register, setting = command[7:9], command[9:11], command[11:13]
+
+        if action == ACTION_GET:
+            if (value := self.registers.get(register)) is None:
+                return bytes([REPLY_ERROR, 0x00, 0x00])
+            return bytes([REPLY_DATA]) + value
+
+        if action == ACTION_SET:
+            self.registers[register] = setting
+        return bytes([REPLY_ACK])
+
+    async def _async_handle_pjlink(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one PJLink connection."""
+        salt = None
+        if self.password:
+            salt = secrets.token_hex(4)
+            writer.write(f"PJLINK 1 {salt}\r".encode())
+        else:
+            writer.write(b"PJLINK 0\r")
+
+        answers = {
+            "NAME": self.name,
+            "INF1": "HITACHI",
+            "INF2": "Simulated projector",
+            "INST": "11 12 31 32 21 22 41 51",
+            "CLSS": "1",
+            "POWR": "1" if self.registers[bytes.fromhex("0060")][0] else "0",
+        }
+
+        try:
+            request = await reader.readuntil(b"\r")
+            if salt is not None:
+                expected = md5((salt + (self.password or "")).encode()).hexdigest()
+                if request[:DIGEST_LENGTH].decode() != expected:
+                    writer.write(b"PJLINK ERRA\r")
+                    await writer.drain()
+                    return
+                request = request[DIGEST_LENGTH:]
+
+            while True:
+                self.counters.pjlink_requests += 1
+                await self.behavior.async_delay()
+                body = request[2:6].decode()
+                writer.write(f"%1{body}={answers.get(body, 'ERR1')}\r".encode())
+                await writer.drain()
+                request = await reader.readuntil(b"\r")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def simulator_hosts(count: int) -> list[str]:
+    """Return the loopback addresses of a number of simulated projectors."""
+    return [f"127.0.0.{index + 2}" for index in range(count)]
+
+
+async def async_start_simulators(
+    count: int, password: str | None = None, behavior: SimulatorBehavior | None = None
+) -> list[ProjectorSimulator]:
+    """Start a number of simulated projectors sharing one behavior."""
+    behavior = behavior or SimulatorBehavior()
+    return [
+        await ProjectorSimulator(
+            host, password, f"Projector {index + 1}", behavior
+        ).async_start()
+        for index, host in enumerate(simulator_hosts(count))
+    ]
+
+
+def add_behavior_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the simulator options shared by every script."""
+    parser.add_argument("--count", type=int, default=1, help="number of projectors")
+    parser.add_argument("--password", help="require this password")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per reply")
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="random +/- seconds per reply"
+    )
+    parser.add_argument(
+        "--drop-rate", type=float, default=0.0, help="share of unanswered frames"
+    )
+    parser.add_argument(
+        "--auth-failure-rate",
+        type=float,
+        default=0.0,
+        help="share of frames rejected as unauthenticated",
+    )
+
+
+def behavior_from_arguments(args: argparse.Namespace) -> SimulatorBehavior:
+    """Build the simulator behavior from parsed options."""
+    return SimulatorBehavior(
+        latency=args.latency,
+        jitter=args.jitter,
+        drop_rate=args.drop_rate,
+        auth_failure_rate=args.auth_failure_rate,
+    )
+
+
+async def async_main(args: argparse.Namespace) -> None:
+    """Serve simulated projectors until interrupted."""
+    simulators = await async_start_simulators(
+        args.count, args.password, behavior_from_arguments(args)
+    )
+    for simulator in simulators:
+        _LOGGER.info("%s listening on %s", simulator.name, simulator.host)
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for simulator in simulators:
+            await simulator.async_stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_behavior_arguments(parser)
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(async_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
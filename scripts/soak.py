@@ -0,0 +1,508 @@
+"""Soak the integration with days of polling and commands against simulated projectors.
+
+Sets up one config entry per simulated projector in a test instance of Home
+Assistant and lets it run on a simulated clock: the monotonic time every
+timer and backoff follows jumps from one due timer to the next, so polls,
+keepalives, idle closes and breaker probes happen at their own pace over
+the simulated days. The projectors are switched on for part of each day
+and blanked at the usual pace while on, PJLink queries are mixed in, and
+one projector is unreachable for a while every day so its breaker trips
+and recovers. Every simulated hour it reports memory, open file
+descriptors, poll latency, the error rate and reconnects, and at the end it
+fails if any of them went beyond its budget:
+
+    python scripts/soak.py --count 16 --days 2 --drop-rate 0.001
+
+Requires pytest-homeassistant-custom-component for the test instance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Iterator
+import contextlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import gc
+import os
+from pathlib import Path
+import resource
+import statistics
+import sys
+import time
+from unittest.mock import patch
+import zoneinfo
+
+from benchmark import (
+    DOMAIN,
+    async_home_assistant,
+    async_setup_entries,
+    async_unload_entries,
+)
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+from simulator import (
+    ProjectorSimulator,
+    add_behavior_arguments,
+    async_start_simulators,
+    behavior_from_arguments,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from homeassistant.util.async_ import get_scheduled_timer_handles
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.hitachiprojector.coordinator import (
+    HitachiProjectorCoordinator,
+    HitachiProjectorData,
+)
+from custom_components.hitachiprojector.pjlink import PJLinkError
+
+# Simulated seconds between commands, and between PJLink queries
+COMMAND_INTERVAL = 600
+PJLINK_INTERVAL = 3600
+# Simulated seconds between the scheduled events of an hour
+EVENT_STEP = 60
+# Hour of each day the first projector becomes unreachable
+OUTAGE_HOUR = 2
+
+# While frames are in flight the clock waits this long in real seconds for
+# their replies, then moves on in steps so timeouts pass without waiting
+SETTLE_PAUSE = 0.001
+SETTLE_PATIENCE = 0.02
+SETTLE_STEP = 0.25
+
+
+def memory_mb() -> float:
+    """Return the resident memory of this process in MB."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            pages = int(statm.read().split()[1])
+    except OSError:
+        # Peak instead of current memory, still catches steady growth
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def open_fds() -> int | None:
+    """Return the number of open file descriptors, if the platform tells."""
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+@dataclass
+class Sample:
+    """Health of the process over one simulated hour."""
+
+    hour: int
+    powered: bool
+    outage: bool
+    memory: float
+    fds: int | None
+    connections: int
+    median_latency: float
+    p95_latency: float
+    calls: int
+    failures: int
+    connects: int
+    reconnects: int
+
+    @property
+    def error_rate(self) -> float:
+        """Return the share of failed protocol calls."""
+        return self.failures / self.calls if self.calls else 0.0
+
+    def __str__(self) -> str:
+        """Format as one report line."""
+        state = ("on" if self.powered else "off") + (" !" if self.outage else "")
+        return (
+            f"{self.hour:>6} {state:>6} {self.memory:>10.1f} {self.fds or '-':>6} "
+            f"{self.connections:>6} {self.median_latency * 1000:>10.2f} "
+            f"{self.p95_latency * 1000:>10.2f} {self.calls:>9} "
+            f"{self.error_rate:>8.2%} {self.connects:>9} {self.reconnects:>10}"
+        )
+
+
+HEADER = (
+    f"{'hour':>6} {'power':>6} {'memory MB':>10} {'fds':>6} {'conns':>6} "
+    f"{'poll ms':>10} {'p95 ms':>10} {'calls':>9} {'errors':>8} {'connects':>9} "
+    f"{'reconnects':>10}"
+)
+
+
+class SimulatedClock:
+    """Monotonic time and local time that move on when told to.
+
+    Both follow real time plus an offset. The event loop reads its time from
+    time.monotonic as well, so its timers follow the simulated clock.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the clock."""
+        self.hass = hass
+        self.offset = 0.0
+        self._monotonic = time.monotonic
+        self._now = dt_util.now
+
+    def monotonic(self) -> float:
+        """Return the simulated monotonic time."""
+        return self._monotonic() + self.offset
+
+    def now(self, time_zone: zoneinfo.ZoneInfo | None = None) -> datetime:
+        """Return the simulated local time."""
+        return self._now(time_zone) + timedelta(seconds=self.offset)
+
+    @contextlib.contextmanager
+    def patch(self) -> Iterator[None]:
+        """Run everything on the simulated clock."""
+        with (
+            patch("time.monotonic", self.monotonic),
+            patch.object(dt_util, "now", self.now),
+        ):
+            yield
+
+    async def async_advance(self, seconds: float) -> None:
+        """Move time on, running every timer that comes due on the way."""
+        until = self.monotonic() + seconds
+        while (now := self.monotonic()) < until:
+            due = min(
+                (
+                    handle.when()
+                    for handle in get_scheduled_timer_handles(self.hass.loop)
+                    if not handle.cancelled()
+                ),
+                default=until,
+            )
+            self.offset += max(min(due, until) - now, 0.0)
+            async_fire_time_changed(self.hass)
+            await self.async_settle()
+
+    async def async_settle(self) -> None:
+        """Wait until every task started so far is done.
+
+        Replies normally arrive within a moment. When they take longer, like
+        when a frame was dropped, time moves on so the timeout passes.
+        """
+        waited = 0.0
+        while self._busy():
+            await asyncio.sleep(SETTLE_PAUSE)
+            waited += SETTLE_PAUSE
+            if waited >= SETTLE_PATIENCE:
+                self.offset += SETTLE_STEP
+
+    @staticmethod
+    def _busy() -> bool:
+        """Return whether any task besides this one and the simulators runs."""
+        current = asyncio.current_task()
+        return any(
+            task is not current
+            and not task.get_coro().__qualname__.startswith("ProjectorSimulator.")
+            for task in asyncio.all_tasks()
+        )
+
+
+class Soak:
+    """Run simulated hours of polling and keep a sample of each."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entries: list[MockConfigEntry],
+        simulators: list[ProjectorSimulator],
+        args: argparse.Namespace,
+    ) -> None:
+        """Initialize the soak."""
+        self.hass = hass
+        self.entries = entries
+        self.simulators = simulators
+        self.clock = SimulatedClock(hass)
+        self.samples: list[Sample] = []
+        self._on_hours = args.on_hours
+        self._outage = args.outage_minutes * 60
+        self._powered = True
+        self._blank = False
+        self._latencies: list[float] = []
+        self._calls = self._failures = self._connects = self._reconnects = 0
+
+        entity_registry = er.async_get(hass)
+        self._blank_switches = [
+            entity_registry.async_get_entity_id(
+                "switch", DOMAIN, f"hitachiprojector_{entry.entry_id}_blank_mode"
+            )
+            for entry in entries
+        ]
+        self._media_players = [
+            entity_registry.async_get_entity_id(
+                "media_player",
+                DOMAIN,
+                f"hitachiprojector_{entry.entry_id}_media_player",
+            )
+            for entry in entries
+        ]
+
+    @contextlib.contextmanager
+    def timing_polls(self) -> Iterator[None]:
+        """Measure how long every poll takes."""
+        update = HitachiProjectorCoordinator._async_update_data
+        latencies = self._latencies
+
+        async def async_timed_update(
+            coordinator: HitachiProjectorCoordinator,
+        ) -> HitachiProjectorData:
+            start = time.perf_counter()
+            try:
+                return await update(coordinator)
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+        with patch.object(
+            HitachiProjectorCoordinator, "_async_update_data", async_timed_update
+        ):
+            yield
+
+    async def async_run_hour(self, hour: int) -> Sample:
+        """Run one simulated hour and sample the process afterwards."""
+        outage = False
+        for elapsed in range(hour * 3600, (hour + 1) * 3600, EVENT_STEP):
+            outage |= self._schedule_events(elapsed)
+            await self.clock.async_settle()
+            await self.clock.async_advance(EVENT_STEP)
+
+        gc.collect()
+        latencies, self._latencies[:] = list(self._latencies), []
+        calls, failures, connects, reconnects = self._protocol_calls()
+        sample = Sample(
+            hour + 1,
+            self._powered,
+            outage,
+            memory_mb(),
+            open_fds(),
+            sum(simulator.open_connections for simulator in self.simulators),
+            statistics.median(latencies),
+            statistics.quantiles(latencies, n=20)[-1],
+            calls - self._calls,
+            failures - self._failures,
+            connects - self._connects,
+            reconnects - self._reconnects,
+        )
+        self._calls, self._failures = calls, failures
+        self._connects, self._reconnects = connects, reconnects
+        self.samples.append(sample)
+        print(sample)
+        return sample
+
+    def unreachable(self) -> list[str]:
+        """Return the projectors whose last poll failed."""
+        return [
+            entry.title
+            for entry in self.entries
+            if not entry.runtime_data.coordinator.last_update_success
+        ]
+
+    def _schedule_events(self, elapsed: int) -> bool:
+        """Start what happens at this point of the day.
+
+        Returns whether the first projector is unreachable.
+        """
+        day_seconds = elapsed % 86400
+        if day_seconds == 0:
+            self._powered = True
+            self._call("media_player", "turn_on", self._media_players)
+        elif day_seconds == self._on_hours * 3600:
+            self._powered = False
+            self._call("media_player", "turn_off", self._media_players)
+
+        outage_start = OUTAGE_HOUR * 3600
+        if self._outage and day_seconds == outage_start:
+            self.hass.async_create_task(self.simulators[0].async_stop())
+        elif self._outage and day_seconds == outage_start + self._outage:
+            self.hass.async_create_task(self.simulators[0].async_start())
+
+        if self._powered and elapsed % COMMAND_INTERVAL == 0:
+            self._blank = not self._blank
+            self._call(
+                "switch", "turn_on" if self._blank else "turn_off", self._blank_switches
+            )
+        if elapsed % PJLINK_INTERVAL == 0:
+            for entry in self.entries:
+                self.hass.async_create_task(self._async_query_pjlink(entry))
+
+        return outage_start <= day_seconds < outage_start + self._outage
+
+    def _call(self, domain: str, service: str, entity_ids: list[str | None]) -> None:
+        """Call a service on every projector, unreachable ones fail it."""
+        self.hass.async_create_task(
+            self._async_call(domain, service, entity_ids), eager_start=False
+        )
+
+    async def _async_call(
+        self, domain: str, service: str, entity_ids: list[str | None]
+    ) -> None:
+        """Call a service and wait for it."""
+        # Commands fail as the command queue reports them
+        with contextlib.suppress(HomeAssistantError, OSError, RuntimeError):
+            await self.hass.services.async_call(
+                domain, service, {"entity_id": entity_ids}, blocking=True
+            )
+
+    async def _async_query_pjlink(self, entry: MockConfigEntry) -> None:
+        """Query the inputs of a projector, which reopens its session."""
+        # Counted as a failed call in the statistics
+        with contextlib.suppress(PJLinkError):
+            await entry.runtime_data.transport.async_get_sources()
+
+    def _protocol_calls(self) -> tuple[int, int, int, int]:
+        """Return the protocol calls made and failed, and the connects so far."""
+        calls = failures = connects = reconnects = 0
+        for entry in self.entries:
+            stats = entry.runtime_data.transport.stats
+            calls += sum(call.calls for call in stats.calls.values())
+            failures += stats.failures
+            connects += stats.connects
+            reconnects += stats.reconnects
+        return calls, failures, connects, reconnects
+
+
+def check_budgets(samples: list[Sample], args: argparse.Namespace) -> list[str]:
+    """Return how the soak went beyond its budgets.
+
+    The first hour warms up caches and connections, growth is measured from
+    its end. Poll latency and the error rate are compared between hours with
+    the projectors in the same power state, leaving out hours with an outage.
+    """
+    baseline, last = samples[0], samples[-1]
+    violations = []
+
+    if (growth := last.memory - baseline.memory) > args.memory_budget:
+        violations.append(
+            f"memory grew {growth:.1f} MB, budget {args.memory_budget} MB"
+        )
+    if (
+        baseline.fds is not None
+        and last.fds is not None
+        and (leaked := last.fds - baseline.fds) > args.fd_budget
+    ):
+        violations.append(f"{leaked} file descriptors leaked, budget {args.fd_budget}")
+    if last.connections > args.count:
+        violations.append(
+            f"{last.connections} connections open to {args.count} projectors"
+        )
+    # The median, a few replies timing out do not make the poll slower
+    first = next(
+        (
+            sample
+            for sample in samples
+            if sample.powered == last.powered and not sample.outage
+        ),
+        last,
+    )
+    if (drift := last.median_latency / first.median_latency) > args.latency_drift:
+        violations.append(
+            f"poll latency drifted {drift:.2f}x, budget {args.latency_drift}x"
+        )
+    # Over all hours in a power state, an hour off makes too few calls
+    for powered in (True, False):
+        calls = failures = 0
+        for sample in samples:
+            if sample.powered == powered and not sample.outage:
+                calls += sample.calls
+                failures += sample.failures
+        if calls and (error_rate := failures / calls) > args.error_budget:
+            violations.append(
+                f"error rate {error_rate:.2%} while {'on' if powered else 'off'}, "
+                f"budget {args.error_budget:.2%}"
+            )
+    return violations
+
+
+async def async_main(args: argparse.Namespace) -> int:
+    """Run the soak and return the exit status."""
+    simulators = await async_start_simulators(
+        args.count, args.password, behavior_from_arguments(args)
+    )
+
+    try:
+        async with async_home_assistant() as hass:
+            entries = [
+                MockConfigEntry(
+                    domain=DOMAIN,
+                    title=simulator.name,
+                    data={"host": simulator.host, "password": args.password or ""},
+                )
+                for simulator in simulators
+            ]
+            for entry in entries:
+                entry.add_to_hass(hass)
+            await async_setup_entries(hass, entries)
+
+            soak = Soak(hass, entries, simulators, args)
+            print(HEADER)
+            with soak.clock.patch(), soak.timing_polls():
+                for hour in range(round(args.days * 24)):
+                    await soak.async_run_hour(hour)
+                unreachable = soak.unreachable()
+                await async_unload_entries(hass, entries)
+    finally:
+        for simulator in simulators:
+            await simulator.async_stop()
+
+    if len(soak.samples) < 2:
+        print("Soak too short to compare, run at least two simulated hours")
+        return 1
+    violations = check_budgets(soak.samples, args)
+    violations.extend(f"{title} still unreachable" for title in unreachable)
+    if violations:
+        for violation in violations:
+            print(f"FAIL: {violation}")
+        return 1
+    print("Every budget held")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_behavior_arguments(parser)
+    parser.add_argument(
+        "--days", type=float, default=1.0, help="simulated days of polling"
+    )
+    parser.add_argument(
+        "--on-hours",
+        type=int,
+        default=12,
+        help="hours the projectors are switched on at the start of each day",
+    )
+    parser.add_argument(
+        "--outage-minutes",
+        type=int,
+        default=20,
+        help="minutes the first projector is unreachable each day, 0 for none",
+    )
+    parser.add_argument(
+        "--memory-budget", type=float, default=20.0, help="MB of memory growth"
+    )
+    parser.add_argument(
+        "--fd-budget", type=int, default=4, help="file descriptors leaked"
+    )
+    parser.add_argument(
+        "--latency-drift",
+        type=float,
+        default=2.0,
+        help="ratio of the last to the first hour's median poll latency, in the "
+        "same power state",
+    )
+    parser.add_argument(
+        "--error-budget",
+        type=float,
+        default=0.01,
+        help="share of failed protocol calls while on or off, outages aside",
+    )
+    sys.exit(asyncio.run(async_main(parser.parse_args())))